@@ -0,0 +1,60 @@
+"""initial schema
+
+Esquema original creado por Base.metadata.create_all / setup_database.py.
+En bases de datos que ya tienen las tablas, marcar la revisión sin ejecutarla:
+    alembic stamp 0001
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-06-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    taskstatus = postgresql.ENUM('pending', 'in_progress', 'done', name='taskstatus')
+    taskstatus.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'tasks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', postgresql.ENUM(name='taskstatus', create_type=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_tasks_id', 'tasks', ['id'])
+    op.create_index('ix_tasks_title', 'tasks', ['title'])
+    op.create_index('ix_tasks_status', 'tasks', ['status'])
+    op.create_index('ix_tasks_created_at', 'tasks', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('tasks')
+    op.drop_table('users')
+    postgresql.ENUM(name='taskstatus').drop(op.get_bind(), checkfirst=True)
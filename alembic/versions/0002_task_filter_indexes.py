@@ -0,0 +1,45 @@
+"""task filter and sort indexes
+
+Índices para la paginación por cursor y los filtros y órdenes de GET /tasks/. Se crean con
+CREATE INDEX CONCURRENTLY para no bloquear escrituras en tablas grandes,
+por eso van fuera de la transacción de la migración.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-06-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_status_created_at_id', 'tasks', ['status', 'created_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_title_id', 'tasks', ['title', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_title_pattern', 'tasks', ['title'],
+                        postgresql_ops={'title': 'varchar_pattern_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_updated_at', 'tasks', ['updated_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_updated_at', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_title_pattern', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_title_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_status_created_at_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_created_at_id', table_name='tasks', postgresql_concurrently=True)
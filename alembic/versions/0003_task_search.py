@@ -0,0 +1,40 @@
+"""task full-text and trigram search
+
+Columna generada search_vector (tsvector de title + description) con índice GIN
+e índice de trigramas sobre title para GET /tasks/search. Añadir la columna
+generada reescribe la tabla: en tablas grandes ejecutar en una ventana de
+mantenimiento. Los índices se crean con CONCURRENTLY.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-07-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_title_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_search_vector")
+    op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
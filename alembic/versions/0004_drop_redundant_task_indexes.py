@@ -0,0 +1,37 @@
+"""drop redundant single-column task indexes
+
+ix_tasks_created_at e ix_tasks_title son prefijos de ix_tasks_created_at_id e
+ix_tasks_title_id: el planificador usa los compuestos para los mismos filtros y órdenes,
+y los simples solo encarecen cada escritura. Se borran con DROP INDEX CONCURRENTLY.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-07-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_title', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tasks_created_at', table_name='tasks',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_created_at', 'tasks', ['created_at'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_title', 'tasks', ['title'],
+                        postgresql_concurrently=True, if_not_exists=True)
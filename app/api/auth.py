@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from app.db.database import get_db
+from app.db.database import get_session
 from app.schemas.user import LoginRequest, Token
-from app.services.auth_service import authenticate_user
-from app.core.security import create_access_token
+from app.services.auth_service import authenticate_user, token_claims
+from app.core.security import create_access_token, PasswordHasherBusy
+from app.core.metrics import record_auth_failure
 from app.core.config import settings
 
 # api de autenticacion (prefijo de la llamada)
@@ -12,11 +13,20 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 
 # sufijo de la llamada
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    # Autenticar al usuario
-    user = authenticate_user(db, login_data.email, login_data.password)
+async def login(login_data: LoginRequest, db: Session = Depends(get_session)):
+    # Autenticar al usuario; si el pool de bcrypt está saturado se descarta el login
+    try:
+        user = await authenticate_user(db, login_data.email, login_data.password)
+    except PasswordHasherBusy:
+        record_auth_failure("hasher_busy")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Demasiados inicios de sesión simultáneos, inténtelo de nuevo",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+        )
     # Si la autenticacion falla, lanzar una excepcion
     if not user:
+        record_auth_failure("bad_credentials")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email o contraseña incorrectos",
@@ -26,7 +36,7 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     # Generar el token JWT
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data=token_claims(user), expires_delta=access_token_expires
     )
     # Retornar el token de acceso para probar por postman
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Response, status
+from app.services.health_service import database_probe
+
+# api de salud para el balanceador y el orquestador (prefijo de la llamada)
+router = APIRouter(prefix="/health", tags=["health"])
+
+# El proceso responde; no consulta la base de datos
+@router.get("/live")
+def liveness():
+    return {"status": "alive"}
+
+# Último resultado de la sonda de base de datos y pool; 503 si no está listo
+@router.get("/ready")
+def readiness(response: Response):
+    result = database_probe.snapshot()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
+
+# Compatibilidad: /health equivale a /health/ready
+@router.get("")
+def health_check(response: Response):
+    """Endpoint para verificar el estado de la API"""
+    return readiness(response)
@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import render_metrics
+
+# api de métricas en formato de exposición de Prometheus
+router = APIRouter(tags=["monitoring"])
+
+# Contadores, histogramas y gauges de todos los workers
+@router.get("/metrics", include_in_schema=False)
+def read_metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.core.profiling import profile_dir
+from app.core.security import token_cache_stats
+from app.db import startup
+from app.db.database import pool_status
+from app.schemas.user import CurrentUser
+from app.services.auth_service import get_current_user, user_cache_stats
+from app.services.task_cache import task_cache_stats
+
+# api de monitorización (prefijo de la llamada)
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+# Estado del pool de conexiones: en uso, overflow, esperas y timeouts
+@router.get("/pool")
+def read_pool_status(current_user: CurrentUser = Depends(get_current_user)):
+    return pool_status()
+
+# Aciertos y fallos de las cachés en proceso
+@router.get("/cache")
+def read_cache_stats(current_user: CurrentUser = Depends(get_current_user)):
+    return {"users": user_cache_stats(), "tokens": token_cache_stats(), "tasks": task_cache_stats()}
+
+# Desglose del último arranque: fases medidas (ms) y acciones realizadas
+@router.get("/startup")
+def read_startup_report(current_user: CurrentUser = Depends(get_current_user)):
+    return startup.last_report or {"status": "not_run"}
+
+# Perfiles guardados por el perfilado bajo demanda (más recientes primero)
+@router.get("/profiles")
+def list_profiles(current_user: CurrentUser = Depends(get_current_user)):
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    return sorted({path.stem for path in directory.glob("*.txt")}, reverse=True)
+
+# Árbol de llamadas (tree) o pilas colapsadas para flamegraph (collapsed)
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def read_profile(
+    profile_id: str,
+    format: str = Query("tree", pattern="^(tree|collapsed)$"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    path = profile_dir() / f"{profile_id}.{'txt' if format == 'tree' else 'collapsed'}"
+    if "/" in profile_id or "\\" in profile_id or ".." in profile_id or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Perfil no encontrado"
+        )
+    return path.read_text(encoding="utf-8")
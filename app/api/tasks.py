@@ -1,85 +1,351 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
-from app.schemas.task import Task, TaskCreate, TaskUpdate, TaskListResponse
+from typing import List, Optional
+from datetime import datetime
+from app.core.config import settings
+from app.core.etag import body_etag, etag_matches, list_etag, parse_task_etag, task_etag
+from app.core.serialization import RawJSONResponse, dump_task
+from app.db.database import SessionLocal, get_session, run_db
+import csv
+import io
+import json
+from app.schemas.task import (
+    BulkMode,
+    CountMode,
+    TaskFileFormat,
+    Task,
+    TaskBulkCreate,
+    TaskBulkCreateResponse,
+    TaskBulkResult,
+    TaskBulkSelection,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskFilter,
+    TaskImportResult,
+    TaskSearchResponse,
+    TaskSort,
+    TaskUpdate,
+    TaskListResponse
+)
+from app.models.task import TaskStatus
 from app.services.task_service import (
     create_task,
+    create_tasks_bulk,
+    update_tasks_bulk,
+    delete_tasks_bulk,
+    validate_task_items,
     get_task,
     get_tasks,
+    iter_tasks,
+    search_tasks,
     update_task,
-    delete_task
+    delete_task,
+    render_tasks_json,
+    InvalidCursorError,
+    TaskVersionConflict
 )
+from app.services.import_service import import_tasks
 from app.services.auth_service import get_current_user
-from app.models.user import User
+from app.schemas.user import CurrentUser
 
 # api de tareas (prefijo de la llamada)
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+
+# Filtros comunes de los listados (parámetros de consulta)
+async def get_task_filter(
+    status: Optional[List[TaskStatus]] = Query(None, description="Uno o varios estados"),
+    created_from: Optional[datetime] = Query(None, description="created_at >= created_from"),
+    created_to: Optional[datetime] = Query(None, description="created_at < created_to"),
+    updated_from: Optional[datetime] = Query(None, description="updated_at >= updated_from"),
+    updated_to: Optional[datetime] = Query(None, description="updated_at < updated_to"),
+    title_prefix: Optional[str] = Query(None, min_length=1, max_length=200, description="Título que empieza por")
+) -> TaskFilter:
+    return TaskFilter(
+        status=status,
+        created_from=created_from,
+        created_to=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+        title_prefix=title_prefix
+    )
+
+
+_EXPORT_FIELDS = ("id", "title", "description", "status", "created_at", "updated_at")
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, TaskStatus):
+        return value.value
+    return value
+
+
+def _export_chunks(export_format: TaskFileFormat, filters: TaskFilter, sort: TaskSort):
+    """Generar el fichero de exportación lote a lote con una sesión propia.
+
+    La sesión de la dependencia no está garantizada mientras se envía el
+    cuerpo de un StreamingResponse, por eso el generador abre la suya.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == TaskFileFormat.CSV:
+        writer.writerow(_EXPORT_FIELDS)
+
+    with SessionLocal() as db:
+        for batch in iter_tasks(db, filters, sort, batch_size=settings.TASK_EXPORT_BATCH_SIZE):
+            for row in batch:
+                values = [_export_value(getattr(row, field)) for field in _EXPORT_FIELDS]
+                if export_format == TaskFileFormat.CSV:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(_EXPORT_FIELDS, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    # Cabecera CSV de una exportación sin filas
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _expected_version(request: Request, task_id: int):
+    """Versión exigida por If-Match; None si no hay precondición"""
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    parsed = parse_task_etag(header.split(",")[0])
+    if parsed is None or parsed[0] != task_id:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match no corresponde a esta tarea"
+        )
+    return parsed[1]
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def _import_upload(stream, file_format: TaskFileFormat) -> dict:
+    # COPY necesita la conexión psycopg síncrona, también con DB_ASYNC
+    with SessionLocal() as db:
+        return import_tasks(db, stream, file_format)
+
 # sufijo de la llamada
 @router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
 # Crear una nueva tarea
-def create_new_task(
+async def create_new_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
    # Crear una nueva tarea
-    return create_task(db=db, task=task)
+    return await run_db(db, create_task, task)
+
+# Crear varias tareas en una sola petición
+@router.post("/bulk", response_model=TaskBulkCreateResponse, status_code=status.HTTP_201_CREATED)
+async def create_tasks_in_bulk(
+    payload: TaskBulkCreate,
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    # Validar todo antes de insertar
+    tasks, errors = validate_task_items(payload.items)
+    if errors and payload.mode == BulkMode.ALL_OR_NOTHING:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+    created = await run_db(db, create_tasks_bulk, tasks)
+    return {"created": created, "errors": errors}
+
+# Actualizar en bloque las tareas indicadas por ids o por filtro
+@router.post("/bulk/update", response_model=TaskBulkResult)
+async def update_tasks_in_bulk(
+    payload: TaskBulkUpdate,
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if not payload.changes.model_fields_set:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="changes no contiene campos a actualizar"
+        )
+    return await run_db(
+        db, update_tasks_bulk, payload.changes,
+        ids=payload.ids, filters=payload.filter, return_ids=payload.return_ids
+    )
+
+# Eliminar en bloque las tareas indicadas por ids o por filtro
+@router.post("/bulk/delete", response_model=TaskBulkResult)
+async def delete_tasks_in_bulk(
+    payload: TaskBulkSelection,
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    return await run_db(
+        db, delete_tasks_bulk,
+        ids=payload.ids, filters=payload.filter, return_ids=payload.return_ids
+    )
 
 # Listar tareas con paginación
 @router.get("/", response_model=TaskListResponse)
-def list_tasks(
+async def list_tasks(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor (ignora page)"),
+    count: Optional[CountMode] = Query(None, description="Cálculo del total: exact, window, estimated o none"),
+    sort: TaskSort = Query(TaskSort.CREATED_AT_DESC, description="Orden; prefijo '-' para descendente"),
+    filters: TaskFilter = Depends(get_task_filter),
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     # Obtener la lista de tareas con paginación
-    return get_tasks(db=db, page=page, page_size=page_size)
+    try:
+        if settings.FAST_JSON:
+            # Cuerpo serializado directamente desde las filas, sin TaskListResponse
+            body = await run_db(
+                db, render_tasks_json, page=page, page_size=page_size, cursor=cursor,
+                count_mode=count, filters=filters, sort=sort
+            )
+            etag = body_etag(body)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return _not_modified(etag)
+            return RawJSONResponse(body, headers={"ETag": etag})
+        result = await run_db(
+            db, get_tasks, page=page, page_size=page_size, cursor=cursor,
+            count_mode=count, filters=filters, sort=sort
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+    # Si el cliente ya tiene esta página no se construye la respuesta
+    etag = list_etag(result)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    return result
+
+# Importar tareas desde un fichero CSV o NDJSON con COPY
+@router.post("/import", response_model=TaskImportResult, status_code=status.HTTP_201_CREATED)
+async def import_task_file(
+    file: UploadFile = File(..., description="CSV con cabecera title,description,status o NDJSON"),
+    format: Optional[TaskFileFormat] = Query(None, description="ndjson o csv; por defecto según la extensión"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    if format is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        format = {"csv": TaskFileFormat.CSV, "ndjson": TaskFileFormat.NDJSON, "jsonl": TaskFileFormat.NDJSON}.get(extension)
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No se pudo deducir el formato: indique format=csv o format=ndjson"
+        )
+    return await run_in_threadpool(_import_upload, file.file, format)
+
+# Exportar todas las tareas del filtro como NDJSON o CSV, en streaming
+@router.get("/export")
+async def export_task_list(
+    format: TaskFileFormat = Query(TaskFileFormat.NDJSON, description="ndjson o csv"),
+    sort: TaskSort = Query(TaskSort.CREATED_AT_DESC, description="Orden; prefijo '-' para descendente"),
+    filters: TaskFilter = Depends(get_task_filter),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    media_type = "text/csv" if format == TaskFileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        _export_chunks(format, filters, sort),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'}
+    )
+
+# Buscar tareas por texto (antes de /{task_id} para que no lo capture)
+@router.get("/search", response_model=TaskSearchResponse)
+async def search_task_list(
+    q: str = Query(..., min_length=1, max_length=200, description="Texto a buscar"),
+    page: int = Query(1, ge=1, description="Número de página"),
+    page_size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    return await run_db(db, search_tasks, q, page=page, page_size=page_size)
 
 # Obtener una tarea por ID
 @router.get("/{task_id}", response_model=Task)
-def read_task(
+async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
    # valor de la tarea
-    db_task = get_task(db=db, task_id=task_id)
+    db_task = await run_db(db, get_task, task_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarea no encontrada"
         )
+    etag = task_etag(db_task)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    if settings.FAST_JSON:
+        return RawJSONResponse(dump_task(db_task), headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return db_task
 
 # Actualizar una tarea existente
 @router.put("/{task_id}", response_model=Task)
-def update_existing_task(
+async def update_existing_task(
     task_id: int,
     task_update: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    
-    db_task = update_task(db=db, task_id=task_id, task_update=task_update)
+    # Con If-Match la actualización solo se aplica si la versión coincide
+    expected_version = _expected_version(request, task_id)
+    try:
+        db_task = await run_db(db, update_task, task_id, task_update, expected_version)
+    except TaskVersionConflict:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="La tarea ha cambiado desde la versión indicada en If-Match"
+        )
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarea no encontrada"
         )
+    response.headers["ETag"] = task_etag(db_task)
     return db_task
 
 # Eliminar una tarea
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_task(
+async def delete_existing_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    db: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    
-    success = delete_task(db=db, task_id=task_id)
+    # Con If-Match el borrado solo se aplica si la versión coincide
+    expected_version = _expected_version(request, task_id)
+    try:
+        success = await run_db(db, delete_task, task_id, expected_version)
+    except TaskVersionConflict:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="La tarea ha cambiado desde la versión indicada en If-Match"
+        )
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+from sqlalchemy.util import await_only
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Caché LRU en memoria acotada por número de entradas y por tiempo de vida"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING or item[1] <= now:
+                if item is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Guardar un valor; ttl permite acortar la vida de una entrada concreta"""
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class MemoryCacheBackend:
+    """Backend de caché en proceso (valores en bytes) sobre TTLCache.
+
+    counter_ttl: vida de los contadores desde su último incremento; debe superar la de las
+    entradas para que, al caducar y volver a 0, ya no quede ninguna entrada que los use.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float, counter_ttl: Optional[float] = None):
+        self._cache = TTLCache(maxsize, ttl)
+        # Los contadores no compiten con las entradas por el LRU (expulsar uno lo pondría a 0
+        # con entradas vivas): caducan por tiempo y se purgan al crecer
+        self.counter_ttl = counter_ttl if counter_ttl is not None else ttl * 10
+        self._counters: dict[str, tuple[int, float]] = {}
+        self._counters_lock = Lock()
+        self._purge_at = 1024
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._cache.set(key, value, ttl)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        value, expires_at = self._counters.get(key, (0, 0.0))
+        return value if expires_at > time.monotonic() else 0
+
+    def incr(self, key: str) -> int:
+        self.incr_many([key])
+        return self.get_counter(key)
+
+    def incr_many(self, keys):
+        now = time.monotonic()
+        expires_at = now + self.counter_ttl
+        with self._counters_lock:
+            for key in keys:
+                value, key_expires_at = self._counters.get(key, (0, 0.0))
+                self._counters[key] = ((value if key_expires_at > now else 0) + 1, expires_at)
+            if len(self._counters) > self._purge_at:
+                self._counters = {
+                    key: item for key, item in self._counters.items() if item[1] > now
+                }
+                self._purge_at = max(1024, len(self._counters) * 2)
+
+    def stats(self) -> dict:
+        with self._cache._lock:
+            entries = list(self._cache._data.values())
+        return {
+            "backend": self.name,
+            "size": len(entries),
+            "maxsize": self._cache.maxsize,
+            "counters": len(self._counters),
+            "memory_bytes": sum(len(value) for value, _ in entries),
+        }
+
+
+class RedisCacheBackend:
+    """Backend compartido entre procesos sobre el protocolo de Redis.
+
+    Acepta cualquier cliente con la interfaz de redis-py (get, set con ex, delete,
+    incr, info); en pruebas sirve un sustituto local como fakeredis.FakeRedis().
+    Los contadores caducan counter_ttl segundos después de su último incremento.
+
+    El cliente es síncrono: con DB_ASYNC los servicios corren en el hilo del event loop
+    (AsyncSession.run_sync) y cada llamada se envía a un hilo y se espera desde el greenlet
+    de SQLAlchemy, sin bloquear el loop. En el threadpool se llama directamente.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, counter_ttl: float = 300):
+        self.client = client
+        self.counter_ttl = counter_ttl
+
+    @classmethod
+    def from_url(cls, url: str, counter_ttl: float = 300) -> "RedisCacheBackend":
+        import redis
+
+        client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        return cls(client, counter_ttl)
+
+    @staticmethod
+    def _call(fn, *args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return fn(*args, **kwargs)
+        return await_only(asyncio.to_thread(fn, *args, **kwargs))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._call(self.client.get, key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._call(self.client.set, key, value, ex=max(1, int(ttl)))
+
+    def delete(self, *keys: str):
+        if keys:
+            self._call(self.client.delete, *keys)
+
+    def get_counter(self, key: str) -> int:
+        value = self._call(self.client.get, key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return self.incr_many([key])[0]
+
+    def incr_many(self, keys) -> list:
+        # Un solo viaje a Redis para todos los contadores (INCR + EXPIRE de cada uno)
+        pipeline = self.client.pipeline(transaction=False)
+        ttl = max(1, int(self.counter_ttl))
+        for key in keys:
+            pipeline.incr(key)
+            pipeline.expire(key, ttl)
+        return self._call(pipeline.execute)[::2]
+
+    def stats(self) -> dict:
+        info = self._call(self.client.info, "memory")
+        return {
+            "backend": self.name,
+            "size": self._call(self.client.dbsize),
+            "memory_bytes": info.get("used_memory"),
+        }
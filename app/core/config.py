@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Literal, Optional
 
 # Ruta explícita al .env (seguro en Windows)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -12,10 +13,108 @@ class Settings(BaseSettings):
     DB_NAME: str = "technical_test"
     DB_USER: str = "postgres"
     DB_PASSWORD: str = "postgres"
+    # URL completa que sustituye a DB_HOST/DB_NAME/...; p. ej. sqlite:///./bench.db en benchmarks
+    DB_URL: Optional[str] = None
+    # Sesiones asíncronas (AsyncEngine) en lugar de sesiones síncronas en el threadpool
+    DB_ASYNC: bool = False
+
+    # Pool de conexiones (por engine y por proceso)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = False
 
     SECRET_KEY: str = "clave magica 123"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Verificación HS256 directa (hmac + json) en lugar de jwt.decode
+    JWT_FAST_PATH: bool = True
+    # Caché de claims verificados por digest del token (0 la desactiva)
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Coste de bcrypt para hashes nuevos; calibrar con calibrate_bcrypt.py.
+    # Los hashes con otro coste se regeneran en el siguiente login correcto
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_TARGET_MS: int = 250
+
+    # Pool dedicado a bcrypt: hilos y trabajos en espera antes de responder 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 16
+    PASSWORD_HASH_RETRY_AFTER: int = 1
+
+    # Caché en proceso del usuario autenticado (0 la desactiva)
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 60
+    # Confiar en los claims uid/ver del token sin consultar la tabla users
+    AUTH_STATELESS: bool = False
+    # Subir este valor invalida todos los tokens emitidos en modo stateless
+    AUTH_TOKEN_VERSION: int = 1
+
+    # Máximo de tareas por petición en POST /tasks/bulk
+    TASK_BULK_MAX_ITEMS: int = 1000
+    # Máximo de ids por petición y filas por sentencia/transacción en bulk update/delete
+    TASK_BULK_MAX_IDS: int = 10000
+    TASK_BULK_CHUNK_SIZE: int = 1000
+
+    # Filas por lote leídas del cursor de servidor en GET /tasks/export
+    TASK_EXPORT_BATCH_SIZE: int = 1000
+
+    # Bytes leídos por lectura del fichero importado y rechazos detallados en la respuesta
+    TASK_IMPORT_CHUNK_SIZE: int = 65536
+    TASK_IMPORT_MAX_ERRORS: int = 100
+
+    # Modo de conteo por defecto de GET /tasks: exact, window, estimated o none
+    TASK_COUNT_MODE: Literal["exact", "window", "estimated", "none"] = "exact"
+    # Segundos que se reutiliza el total estimado antes de volver a consultarlo
+    TASK_COUNT_CACHE_SECONDS: int = 60
+
+    # Caché de lectura de GET /tasks y GET /tasks/{id}: none, memory (por proceso) o redis
+    TASK_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    TASK_CACHE_TTL_SECONDS: int = 30
+    TASK_CACHE_MAX_ITEMS: int = 10000
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Respuestas con orjson y serializadores precompilados, sin revalidar filas de la BD
+    FAST_JSON: bool = False
+    # Con FAST_JSON, cómo se genera GET /tasks: rows (filas Core) o json_agg (PostgreSQL)
+    TASK_LIST_RENDER: Literal["rows", "json_agg"] = "rows"
+
+    # Middleware de métricas y GET /metrics (formato Prometheus); con varios workers
+    # definir PROMETHEUS_MULTIPROC_DIR en el entorno antes de arrancar
+    METRICS_ENABLED: bool = True
+
+    # Modo depuración: cabeceras X-DB-Queries/Server-Timing y aviso de N+1 por petición
+    DEBUG: bool = False
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # Sentencias más lentas que esto se registran (parámetros sin valores); 0 lo desactiva
+    SLOW_QUERY_MS: float = 200
+
+    # Perfilado bajo demanda: peticiones con cabecera X-Profile igual a PROFILING_TOKEN
+    # o una fracción aleatoria (PROFILING_SAMPLE_RATE); sampling o cprofile
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_MODE: Literal["sampling", "cprofile"] = "sampling"
+    PROFILING_INTERVAL_MS: float = 2.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+    # Sonda de readiness en segundo plano: cada cuánto, cuánto esperar y umbrales
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MAX_DB_RTT_MS: float = 500
+    HEALTH_MAX_POOL_SATURATION: float = 0.9
+
+    # Al arrancar: comprobar el stamp de Alembic y crear el usuario inicial si falta
+    # (desactivar si todo se lanza desde un job aparte)
+    DB_STARTUP_CHECK: bool = True
+    # Aplicar también las migraciones pendientes al arrancar; desactivado porque algunas
+    # reescriben la tabla (ventana de mantenimiento con setup_database.py)
+    DB_STARTUP_MIGRATE: bool = False
+    # Espera máxima por el advisory lock de migraciones entre workers
+    DB_STARTUP_LOCK_TIMEOUT_SECONDS: float = 600
 
   
     INITIAL_USER_EMAIL: str = "admin@example.com"
@@ -23,6 +122,8 @@ class Settings(BaseSettings):
 
     @property
     def DATABASE_URL(self) -> str:
+        if self.DB_URL:
+            return self.DB_URL
         return (
             f"postgresql+psycopg://"
             f"{self.DB_USER}:{self.DB_PASSWORD}"
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import hashlib
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _microseconds(value: datetime) -> int:
+    """Microsegundos desde epoch sin pasar por float (la ETag debe ser exacta)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def task_version(task) -> datetime:
+    """Versión de una tarea: última modificación o, si nunca se modificó, creación"""
+    return task.updated_at or task.created_at
+
+
+def same_version(task, version: datetime) -> bool:
+    """Comparar la versión de una tarea con la de If-Match (fechas con o sin zona, como UTC)"""
+    return _microseconds(task_version(task)) == _microseconds(version)
+
+
+def task_etag(task) -> str:
+    return f'"{task.id}-{_microseconds(task_version(task))}"'
+
+
+def parse_task_etag(etag: str) -> Optional[tuple[int, datetime]]:
+    """(id, versión) de una ETag generada por task_etag; None si no es válida"""
+    value = etag.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        task_id, micros = value.strip('"').split("-", 1)
+        return int(task_id), _EPOCH + timedelta(microseconds=int(micros))
+    except ValueError:
+        return None
+
+
+def list_etag(result: dict) -> str:
+    """ETag de una página: versiones de sus tareas más los datos de paginación"""
+    digest = hashlib.blake2b(digest_size=16)
+    for task in result["items"]:
+        digest.update(f"{task.id}-{_microseconds(task_version(task))};".encode("ascii"))
+    digest.update(f"{result['total']}|{result['has_next']}|{result['next_cursor']}".encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match / If-Match con una ETag"""
+    if header is None:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return True
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+
+def body_etag(body: bytes) -> str:
+    """ETag de un cuerpo ya serializado (ruta FAST_JSON)"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
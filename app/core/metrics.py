@@ -0,0 +1,150 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+# Con varios workers de uvicorn/gunicorn cada proceso escribe sus métricas en ficheros
+# mmap de PROMETHEUS_MULTIPROC_DIR y /metrics las agrega al leerlas. La variable debe
+# existir (y el directorio estar vacío) antes de arrancar los workers.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 10_000_000)
+
+REQUESTS = Counter(
+    "http_requests_total", "Peticiones HTTP atendidas", ("method", "route", "status")
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP", ("method", "route"),
+    buckets=LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Tamaño del cuerpo de las respuestas HTTP", ("method", "route"),
+    buckets=SIZE_BUCKETS
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Peticiones HTTP en curso", multiprocess_mode="livesum"
+)
+AUTH_FAILURES = Counter(
+    "auth_failures_total", "Autenticaciones rechazadas", ("reason",)
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Conexiones permanentes configuradas en el pool", ("pool",),
+    multiprocess_mode="livesum"
+)
+DB_POOL_OPEN = Gauge(
+    "db_pool_connections_open", "Conexiones abiertas por el pool", ("pool",),
+    multiprocess_mode="livesum"
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "Conexiones prestadas a sesiones", ("pool",),
+    multiprocess_mode="livesum"
+)
+
+# Rutas sin coincidencia (404) comparten etiqueta para no disparar la cardinalidad
+UNMATCHED_ROUTE = "unmatched"
+
+
+def record_auth_failure(reason: str):
+    AUTH_FAILURES.labels(reason).inc()
+
+
+def instrument_engine(engine, name: str):
+    """Gauges del pool de un Engine a partir de sus eventos (sin trabajo en cada scrape)"""
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    if callable(size):
+        DB_POOL_SIZE.labels(name).set(size())
+    opened = DB_POOL_OPEN.labels(name)
+    in_use = DB_POOL_IN_USE.labels(name)
+    event.listen(engine, "connect", lambda *args: opened.inc())
+    event.listen(engine, "close", lambda *args: opened.dec())
+    event.listen(engine, "checkout", lambda *args: in_use.inc())
+    event.listen(engine, "checkin", lambda *args: in_use.dec())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """Descartar los gauges live* de este worker al pararlo"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Middleware ASGI puro: contador, latencia y tamaño por (método, plantilla de ruta).
+
+    La etiqueta de ruta es la plantilla (/tasks/{task_id}), resuelta a partir del
+    endpoint que el router deja en el scope. Los hijos etiquetados se cachean para
+    no pasar por labels() en cada petición.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths = None
+        self._children = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._route_paths is None:
+            self._route_paths = {
+                getattr(route, "endpoint", None): route.path for route in scope["app"].routes
+            }
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+
+    def _observers(self, method: str, route: str, status: int):
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = (
+                REQUESTS.labels(method, route, str(status)),
+                LATENCY.labels(method, route),
+                RESPONSE_SIZE.labels(method, route),
+            )
+            self._children[key] = children
+        return children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_PROGRESS.dec()
+            requests, latency, response_size = self._observers(scope["method"], self._route(scope), status)
+            requests.inc()
+            latency.observe(elapsed)
+            response_size.observe(size)
@@ -0,0 +1,304 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import BASE_DIR, settings
+
+# Perfilado bajo demanda (PROFILING_ENABLED). Sin activar no se instala el middleware y
+# run_db solo consulta una ContextVar vacía.
+#
+# - sampling: un hilo muestrea cada PROFILING_INTERVAL_MS las pilas del event loop (solo
+#   mientras ejecuta la tarea de esta petición) y de los hilos que corren su trabajo vía
+#   run_db. Genera pilas colapsadas (flamegraph.pl, speedscope) y un árbol de llamadas.
+# - cprofile: perfilado determinista con cProfile en el event loop y en cada hilo de
+#   run_db. Mide también lo que otras peticiones ejecuten en el loop a la vez: usarlo con
+#   poca carga. Solo hay una sesión cprofile a la vez (dos perfiles en el hilo del loop se
+#   pisan en 3.11 y fallan en 3.12+); las peticiones que llegan mientras tanto no se perfilan.
+
+# Desde 3.12 cProfile usa sys.monitoring: un único perfil activo en todo el proceso,
+# que ya registra los hilos del threadpool
+_THREAD_PROFILES = sys.version_info < (3, 12)
+_cprofile_slot = threading.Lock()
+
+_current_session: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+
+# Fase a la que se atribuye una pila según el módulo más profundo reconocible
+_PHASES = (
+    ("auth", ("app/services/auth_service", "app/core/security", "jose/", "bcrypt", "passlib/")),
+    ("service", ("app/services/", "app/db/", "sqlalchemy/", "psycopg")),
+    ("serialization", ("app/core/serialization", "pydantic", "fastapi/encoders", "json/", "orjson")),
+)
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def current_session() -> Optional["ProfileSession"]:
+    return _current_session.get()
+
+
+def profile_dir() -> Path:
+    path = Path(settings.PROFILING_OUTPUT_DIR)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def _current_task_reader(loop):
+    """Función que devuelve la tarea en curso de `loop` leída desde otro hilo, o None.
+
+    asyncio no lo ofrece públicamente (current_task solo vale dentro del loop): se usa el
+    registro interno asyncio.tasks._current_tasks si existe con la forma esperada.
+    """
+    current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+    if not isinstance(current_tasks, dict):
+        return None
+    return lambda: current_tasks.get(loop)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _phase(filenames: tuple) -> str:
+    for filename in reversed(filenames):
+        normalized = filename.replace("\\", "/")
+        for phase, markers in _PHASES:
+            if any(marker in normalized for marker in markers):
+                return phase
+    return "framework"
+
+
+class ProfileSession:
+    """Perfil de una petición: muestras de pilas o estadísticas de cProfile"""
+
+    def __init__(self, mode: str, interval: float):
+        self.mode = mode
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.threads: set[int] = set()
+        self.profiles: list[cProfile.Profile] = []
+        self.started = 0.0
+        self.seconds = 0.0
+        self.stopped = False
+        self._loop_thread = threading.get_ident()
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._loop_profile: Optional[cProfile.Profile] = None
+        self._lock = threading.Lock()
+        self._holds_slot = False
+
+    def start(self) -> bool:
+        """Empezar a perfilar; False si ya hay otra sesión cprofile en curso"""
+        if self.mode == "cprofile":
+            if not _cprofile_slot.acquire(blocking=False):
+                return False
+            self._holds_slot = True
+        self.started = time.perf_counter()
+        if self.mode == "cprofile":
+            self._loop_profile = cProfile.Profile()
+            self._loop_profile.enable()
+        else:
+            self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+            self._sampler.start()
+        return True
+
+    def stop(self):
+        if self.stopped:
+            return
+        self.stopped = True
+        self.seconds = time.perf_counter() - self.started
+        if self._loop_profile is not None:
+            self._loop_profile.disable()
+            self.profiles.append(self._loop_profile)
+        if self._holds_slot:
+            self._holds_slot = False
+            _cprofile_slot.release()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+
+    def wrap(self, fn):
+        """Función equivalente que marca (o perfila) el hilo que la ejecuta"""
+        def profiled(*args, **kwargs):
+            thread = threading.get_ident()
+            if thread == self._loop_thread:
+                # run_sync en el propio loop: ya lo cubre el perfil del loop
+                return fn(*args, **kwargs)
+            if self.mode == "cprofile":
+                if not _THREAD_PROFILES:
+                    return fn(*args, **kwargs)
+                profile = cProfile.Profile()
+                try:
+                    return profile.runcall(fn, *args, **kwargs)
+                finally:
+                    with self._lock:
+                        self.profiles.append(profile)
+            with self._lock:
+                self.threads.add(thread)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.threads.discard(thread)
+        return profiled
+
+    def _sample(self):
+        own = threading.get_ident()
+        # Sin acceso a la tarea en curso se muestrea siempre el loop (incluye otras peticiones)
+        current_task = _current_task_reader(self._loop)
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                threads = set(self.threads)
+            if current_task is None or current_task() is self._task:
+                threads.add(self._loop_thread)
+            frames = sys._current_frames()
+            for thread in threads:
+                frame = frames.get(thread)
+                if frame is None or thread == own:
+                    continue
+                labels, filenames = [], []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    filenames.append(frame.f_code.co_filename)
+                    frame = frame.f_back
+                labels.reverse()
+                filenames.reverse()
+                self.samples[(_phase(tuple(filenames)),) + tuple(labels)] += 1
+
+    def collapsed(self) -> str:
+        """Pilas colapsadas 'fase;raíz;...;hoja N', entrada de flamegraph.pl y speedscope"""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.samples.most_common())
+
+    def phases(self) -> dict:
+        totals = Counter()
+        for stack, count in self.samples.items():
+            totals[stack[0]] += count
+        return dict(totals)
+
+    def call_tree(self) -> str:
+        if self.mode == "cprofile":
+            output = io.StringIO()
+            stats = pstats.Stats(*self.profiles, stream=output) if self.profiles else None
+            if stats is not None:
+                stats.sort_stats("cumulative").print_stats(60)
+            return output.getvalue()
+
+        tree: dict = {}
+        for stack, count in self.samples.items():
+            node = tree
+            for label in stack:
+                entry = node.setdefault(label, [0, {}])
+                entry[0] += count
+                node = entry[1]
+        total = sum(self.samples.values())
+        if not total:
+            return (
+                f"0 muestras: la petición ({self.seconds * 1000:.1f} ms) duró menos que "
+                f"PROFILING_INTERVAL_MS ({self.interval * 1000:.1f} ms)\n"
+            )
+        phases = ", ".join(
+            f"{phase} {count / total:.0%}" for phase, count in sorted(self.phases().items(), key=lambda item: -item[1])
+        )
+        lines = [
+            f"{total} muestras cada {self.interval * 1000:.1f} ms, {self.seconds * 1000:.1f} ms de petición",
+            f"fases: {phases}",
+        ]
+
+        def walk(node: dict, depth: int):
+            for label, (count, children) in sorted(node.items(), key=lambda item: -item[1][0]):
+                # Las ramas por debajo del 0,5 % solo añaden ruido
+                if count / total < 0.005:
+                    continue
+                lines.append(f"{'  ' * depth}{count / total:6.1%}  {label}")
+                walk(children, depth + 1)
+
+        walk(tree, 0)
+        return "\n".join(lines) + "\n"
+
+    def save(self, method: str, path: str) -> str:
+        """Guardar el perfil en PROFILING_OUTPUT_DIR; devuelve su identificador"""
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = _SAFE_NAME.sub("_", f"{method}{path}").strip("_")[:80]
+        profile_id = f"{stamp}-{name}-{random.getrandbits(32):08x}"
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{profile_id}.txt").write_text(self.call_tree(), encoding="utf-8")
+        if self.mode != "cprofile":
+            (directory / f"{profile_id}.collapsed").write_text(self.collapsed(), encoding="utf-8")
+        return profile_id
+
+
+def _requested(scope) -> bool:
+    """Cabecera X-Profile con el token de PROFILING_TOKEN"""
+    if not settings.PROFILING_TOKEN:
+        return False
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return hmac.compare_digest(value, settings.PROFILING_TOKEN.encode("utf-8"))
+    return False
+
+
+class ProfilingMiddleware:
+    """Perfila las peticiones pedidas con X-Profile o elegidas por PROFILING_SAMPLE_RATE.
+
+    El resultado se guarda en PROFILING_OUTPUT_DIR y su id vuelve en la cabecera X-Profile-Id
+    (consultable en GET /monitoring/profiles/{id}).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (
+            _requested(scope) or random.random() < settings.PROFILING_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(settings.PROFILING_MODE, settings.PROFILING_INTERVAL_MS / 1000)
+        if not session.start():
+            # Otra petición ocupa el perfil cprofile: esta se atiende sin perfilar
+            await self.app(scope, receive, send)
+            return
+        token = _current_session.set(session)
+        # El id se conoce al terminar: las cabeceras se retienen hasta el último fragmento
+        pending_start = None
+
+        async def send_wrapper(message):
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                pending_start = message
+                return
+            if pending_start is not None and not message.get("more_body", False):
+                session.stop()
+                profile_id = await asyncio.to_thread(session.save, scope["method"], scope["path"])
+                headers = list(pending_start.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                await send({**pending_start, "headers": headers})
+                pending_start = None
+            elif pending_start is not None:
+                # Respuesta en streaming: no se espera al final para empezar a enviar
+                await send(pending_start)
+                pending_start = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_session.reset(token)
+            if not session.stopped:
+                session.stop()
+                await asyncio.to_thread(session.save, scope["method"], scope["path"])
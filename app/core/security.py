@@ -1,11 +1,39 @@
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from jose import JWTError, jwt
 
+import asyncio
+import base64
 import bcrypt
+import hashlib
+import hmac
+import json
+import time
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 
+class PasswordHasherBusy(Exception):
+    """La cola de hashing de contraseñas está llena"""
+
+
+# bcrypt libera el GIL mientras calcula: un pool de hilos propio da paralelismo real
+# sin ocupar el threadpool que comparten el resto de endpoints
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+_password_jobs = 0
+_password_jobs_lock = Lock()
+
+# Claims ya verificados por digest del token; cada entrada caduca como muy tarde con su exp
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+# Estado HMAC con la clave ya procesada: copy() evita recalcular el padding de la clave
+_hs256_mac = hmac.new(settings.SECRET_KEY.encode("utf-8"), digestmod=hashlib.sha256)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verificar contraseña usando bcrypt"""
     try:
@@ -17,11 +45,75 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    """Generar hash de contraseña usando bcrypt"""
-    salt = bcrypt.gensalt(rounds=12)
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+    """Generar hash de contraseña usando bcrypt (coste BCRYPT_ROUNDS por defecto)"""
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
+
+def password_hash_rounds(hashed_password: str) -> Optional[int]:
+    """Coste de un hash bcrypt con formato $2b$<coste>$<salt+hash>"""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return password_hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int = 4, max_rounds: int = 16, samples: int = 3):
+    """Mayor coste de bcrypt cuya verificación no supera target_ms en esta máquina.
+
+    Devuelve el coste elegido y los milisegundos medidos por coste.
+    """
+    password = b"calibracion-bcrypt"
+    chosen = min_rounds
+    timings = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        elapsed = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            bcrypt.checkpw(password, hashed)
+            elapsed.append(time.perf_counter() - start)
+        timings[rounds] = min(elapsed) * 1000
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+def _release_password_job(future):
+    global _password_jobs
+    with _password_jobs_lock:
+        _password_jobs -= 1
+
+
+async def _run_password_job(fn, *args):
+    """Ejecutar fn en el pool de bcrypt o fallar si ya hay demasiados trabajos pendientes"""
+    global _password_jobs
+    with _password_jobs_lock:
+        if _password_jobs >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT:
+            raise PasswordHasherBusy()
+        _password_jobs += 1
+    # El contador se libera al terminar el trabajo, aunque la petición se cancele antes
+    future = _password_executor.submit(fn, *args)
+    future.add_done_callback(_release_password_job)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verificar contraseña en el pool de bcrypt"""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generar hash de contraseña en el pool de bcrypt"""
+    return await _run_password_job(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -33,9 +125,73 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def decode_access_token(token: str):
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# Claims registrados que python-jose valida por tipo al decodificar
+_NUMERIC_CLAIMS = ("exp", "nbf", "iat")
+_STRING_CLAIMS = ("sub", "jti")
+
+
+def _decode_hs256(token: str) -> Optional[dict]:
+    """Verificación HS256 directa con hmac/json, equivalente a jwt.decode para nuestros tokens"""
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        if json.loads(_b64url_decode(header_segment)).get("alg") != "HS256":
+            return None
+        mac = _hs256_mac.copy()
+        mac.update(f"{header_segment}.{payload_segment}".encode("ascii"))
+        if not hmac.compare_digest(mac.digest(), _b64url_decode(signature_segment)):
+            return None
+        payload = json.loads(_b64url_decode(payload_segment))
+    except (ValueError, AttributeError):
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    # Claims fuera de la forma de nuestros tokens (aud, fechas no numéricas, sub o jti que
+    # no son cadenas): se delega en python-jose para decidir exactamente igual que él
+    if "aud" in payload or any(
+        name in payload and (not isinstance(payload[name], (int, float)) or isinstance(payload[name], bool))
+        for name in _NUMERIC_CLAIMS
+    ) or any(name in payload and not isinstance(payload[name], str) for name in _STRING_CLAIMS):
+        return _decode_jose(token)
+    # python-jose compara en segundos enteros
+    now = int(time.time())
+    if "exp" in payload and int(payload["exp"]) < now:
+        return None
+    if "nbf" in payload and int(payload["nbf"]) > now:
+        return None
+    return payload
+
+
+def _decode_jose(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def decode_access_token(token: str):
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _token_cache.get(digest)
+    if payload is not None:
+        return payload
+
+    if settings.JWT_FAST_PATH and settings.ALGORITHM == "HS256":
+        payload = _decode_hs256(token)
+    else:
+        payload = _decode_jose(token)
+
+    if payload is not None:
+        exp = payload.get("exp")
+        ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+        if ttl is None or ttl > 0:
+            _token_cache.set(digest, payload, ttl=ttl)
+    return payload
+
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+from app.core.config import settings
+from app.models.task import TaskStatus
+
+
+# Serializadores precompilados de la ruta rápida (FAST_JSON). Los datos vienen de la base
+# de datos, así que no se validan: TypeAdapter.dump_json solo serializa, con el mismo
+# formato de salida que los modelos de respuesta (enum por valor, fechas ISO 8601).
+class TaskRow(TypedDict):
+    title: str
+    description: Optional[str]
+    status: TaskStatus
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+
+class TaskPageMeta(TypedDict):
+    total: Optional[int]
+    page: Optional[int]
+    page_size: int
+    total_pages: Optional[int]
+    has_next: bool
+    next_cursor: Optional[str]
+
+
+class TaskPage(TypedDict):
+    items: list[TaskRow]
+    total: Optional[int]
+    page: Optional[int]
+    page_size: int
+    total_pages: Optional[int]
+    has_next: bool
+    next_cursor: Optional[str]
+
+
+# Mismo orden de campos que schemas.Task
+TASK_FIELDS = tuple(TaskRow.__annotations__)
+
+_task_adapter = TypeAdapter(TaskRow)
+_page_adapter = TypeAdapter(TaskPage)
+_meta_adapter = TypeAdapter(TaskPageMeta)
+
+
+class RawJSONResponse(Response):
+    """Respuesta con un cuerpo JSON ya serializado"""
+    media_type = "application/json"
+
+
+def default_response_class():
+    return ORJSONResponse if settings.FAST_JSON else JSONResponse
+
+
+def task_row(task) -> dict:
+    """Campos de una tarea desde un objeto ORM, una fila Core o un schemas.Task"""
+    return {field: getattr(task, field) for field in TASK_FIELDS}
+
+
+def dump_task(task) -> bytes:
+    return _task_adapter.dump_json(task_row(task))
+
+
+def dump_task_page(result: dict) -> bytes:
+    """Serializar el resultado de get_tasks con el formato de TaskListResponse"""
+    return _page_adapter.dump_json({**result, "items": [task_row(task) for task in result["items"]]})
+
+
+def splice_task_page(items_json: bytes, meta: dict) -> bytes:
+    """Componer TaskListResponse con un array de items ya serializado (p. ej. por json_agg)"""
+    return b'{"items":' + items_json + b"," + _meta_adapter.dump_json(meta)[1:]
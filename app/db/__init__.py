@@ -1,20 +1,5 @@
-from sqlalchemy.orm import Session
-from app.db.database import Base, engine
-from app.models.user import User
-from app.core.security import get_password_hash
-from app.core.config import settings
-
 def init_db():
-    # 🔹 Crear tablas
-    Base.metadata.create_all(bind=engine)
+    """Crear esquema y usuario inicial si faltan (ver app.db.startup.run_startup)"""
+    from app.db.startup import run_startup
 
-    # 🔹 Crear usuario inicial (idempotente)
-    with Session(engine) as db:
-        user = db.query(User).filter(User.email == settings.INITIAL_USER_EMAIL).first()
-        if not user:
-            user = User(
-                email=settings.INITIAL_USER_EMAIL,
-                hashed_password=get_password_hash(settings.INITIAL_USER_PASSWORD)
-            )
-            db.add(user)
-            db.commit()
+    return run_startup()
@@ -1,20 +1,85 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.profiling import current_session
+from app.db.instrumentation import track_queries
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_snapshot
 
-DATABASE_URL = (
-    f"postgresql+psycopg://{settings.DB_USER}:"
-    f"{settings.DB_PASSWORD}@{settings.DB_HOST}:"
-    f"{settings.DB_PORT}/{settings.DB_NAME}"
-)
+DATABASE_URL = settings.DATABASE_URL
+
+
+def _pool_options(poolclass) -> dict:
+    if DATABASE_URL.startswith("sqlite"):
+        # SQLite (pruebas y benchmarks): pool por defecto; las sesiones cruzan hilos del threadpool
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+        # Sesiones en UTC: las fechas salen con 'Z' en todas las rutas de serialización
+        "connect_args": {"options": "-c timezone=UTC"},
+    }
 
-engine = create_engine(DATABASE_URL, echo=False)
+
+engine = create_engine(DATABASE_URL, echo=False, **_pool_options(InstrumentedQueuePool))
+# Conteo y tiempo de sentencias por petición y log de consultas lentas
+track_queries(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# psycopg 3 trae driver asíncrono, la misma URL sirve para el AsyncEngine
+async_engine = (
+    create_async_engine(DATABASE_URL, echo=False, **_pool_options(InstrumentedAsyncQueuePool))
+    if settings.DB_ASYNC else None
+)
+if async_engine is not None:
+    track_queries(async_engine.sync_engine)
+# expire_on_commit=False: los objetos se serializan fuera de la sesión, donde no hay I/O implícito
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependencia de sesión de los routers, según DB_ASYNC
+get_session = get_async_db if settings.DB_ASYNC else get_db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """Ejecutar una función de servicio síncrona sin bloquear el event loop.
+
+    Con AsyncSession la función corre vía run_sync y el I/O es asíncrono;
+    con Session se envía al threadpool, como hacían los handlers síncronos.
+    """
+    profile = current_session()
+    if profile is not None:
+        fn = profile.wrap(fn)
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def pool_status() -> dict:
+    """Estado de los pools de conexiones (hook para métricas y monitorización)"""
+    status = {"sync": pool_snapshot(engine.pool)}
+    if async_engine is not None:
+        status["async"] = pool_snapshot(async_engine.sync_engine.pool)
+    return status
@@ -0,0 +1,160 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+
+class QueryStats:
+    """Sentencias y tiempo de base de datos acumulados durante una petición"""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def repeated(self, threshold: int) -> list:
+        """Sentencias ejecutadas al menos `threshold` veces (patrón N+1)"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+
+
+# Estadísticas de la petición en curso; el threadpool y run_sync heredan el contexto
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """SQL sin espacios redundantes y con las listas IN (...) de tamaño variable colapsadas"""
+    return _IN_LIST.sub("(...)", _SPACES.sub(" ", statement).strip())
+
+
+def _placeholder(value) -> Optional[str]:
+    return None if value is None else f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    """Parámetros sin valores, solo sus tipos (el log no debe contener datos de usuarios)"""
+    if executemany:
+        return f"<{len(parameters)} filas>"
+    if isinstance(parameters, dict):
+        return {key: _placeholder(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_placeholder(value) for value in parameters]
+    return _placeholder(parameters)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        stats.statements[statement] += 1
+    if settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Consulta lenta (%.1f ms): %s | parámetros: %s",
+            elapsed * 1000, normalize_statement(statement), redact_parameters(parameters, executemany)
+        )
+
+
+def track_queries(engine):
+    """Registrar los eventos de conteo, tiempo y log de consultas lentas en un Engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class StatementTracker:
+    """Registro de las sentencias ejecutadas en un Engine, para pruebas.
+
+    with StatementTracker(engine) as tracker:
+        client.get("/tasks/")
+    assert tracker.count == 1
+    tracker.assert_no_repeats()
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "StatementTracker":
+        self.statements.clear()
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> list:
+        counts = Counter(normalize_statement(statement) for statement in self.statements)
+        return [(statement, n) for statement, n in counts.most_common() if n >= threshold]
+
+    def assert_no_repeats(self, threshold: int = 2):
+        """Fallar si alguna sentencia se repite `threshold` veces o más (N+1)"""
+        repeated = self.repeated(threshold)
+        assert not repeated, "Sentencias repetidas (posible N+1): " + "; ".join(
+            f"{n}x {statement[:120]}" for statement, n in repeated
+        )
+
+
+class QueryStatsMiddleware:
+    """Middleware ASGI que abre un QueryStats por petición.
+
+    En modo DEBUG añade X-DB-Queries y Server-Timing a la respuesta y avisa en el log
+    cuando una misma sentencia se repite N_PLUS_ONE_THRESHOLD veces o más.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode("latin-1")))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries"'.encode("latin-1")
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            if settings.DEBUG and settings.N_PLUS_ONE_THRESHOLD:
+                for statement, n in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                    logger.warning(
+                        "Posible N+1 en %s %s: %d ejecuciones de %s",
+                        scope["method"], scope["path"], n, normalize_statement(statement)[:200]
+                    )
@@ -0,0 +1,91 @@
+import logging
+import time
+from threading import Lock
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Contadores de checkout de un pool: esperas, máximo en uso y timeouts"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.in_use_max = 0
+
+    def record_checkout(self, wait: float, in_use: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+            if in_use > self.in_use_max:
+                self.in_use_max = in_use
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / attempts * 1000, 3) if attempts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "in_use_max": self.in_use_max,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Mide el tiempo que cada checkout espera una conexión libre del pool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            wait = time.perf_counter() - start
+            self.stats.record_timeout(wait)
+            logger.warning(f"Timeout esperando conexión del pool tras {wait:.3f}s: {self.status()}")
+            raise
+        self.stats.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_snapshot(pool) -> dict:
+    """Estado actual del pool más los contadores acumulados"""
+    # QueuePool.overflow() parte de -pool_size: negativo mientras no se han abierto
+    # pool_size conexiones. Se expone solo el exceso real sobre pool_size
+    data = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+    }
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        data.update(stats.snapshot())
+    return data
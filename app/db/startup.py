@@ -0,0 +1,265 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+
+from app.core.config import BASE_DIR, settings
+from app.db.database import DATABASE_URL, engine
+
+logger = logging.getLogger(__name__)
+
+# Rutina única de arranque: base de datos, esquema (Alembic) y usuario inicial.
+#
+# El caso habitual (esquema en la revisión head y usuario inicial creado) cuesta una
+# consulta y no importa Alembic, los modelos ni bcrypt. Solo si falta algo se toma un
+# advisory lock (varios workers arrancando a la vez), se vuelve a comprobar y se hace
+# lo que falte. La aplicación solo migra con DB_STARTUP_MIGRATE: algunas migraciones
+# reescriben la tabla y deben lanzarse en una ventana de mantenimiento (setup_database.py).
+
+ALEMBIC_DIR = BASE_DIR / "alembic"
+# Revisión que corresponde al esquema de create_all / setup_database.py antiguos
+BASELINE_REVISION = "0001"
+# Clave del advisory lock de PostgreSQL que serializa las migraciones
+MIGRATION_LOCK_KEY = 0x7461736B
+# Espera entre intentos de tomar el lock
+LOCK_POLL_SECONDS = 0.5
+
+_REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=\n]*=\s*(?:['\"](\w+)['\"]|None)", re.M)
+
+# Stamp de Alembic y usuario inicial en una sola consulta (falla si faltan las tablas)
+_STATE = text(
+    "SELECT v.version_num, EXISTS (SELECT 1 FROM users WHERE email = :email) "
+    "FROM alembic_version v"
+)
+
+# Último resultado de run_startup (GET /monitoring/startup)
+last_report: Optional[dict] = None
+
+
+def head_revision() -> Optional[str]:
+    """Revisión head leyendo las cabeceras de alembic/versions, sin importar Alembic"""
+    revisions, parents = set(), set()
+    for path in (ALEMBIC_DIR / "versions").glob("*.py"):
+        for name, value in _REVISION_LINE.findall(path.read_text(encoding="utf-8")):
+            if name == "revision":
+                revisions.add(value)
+            elif value:
+                parents.add(value)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    # Sin alembic.ini: env.py no reconfigura el logging de la aplicación
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", DATABASE_URL)
+    return config
+
+
+@contextmanager
+def _phase(report: dict, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        report["phases_ms"][name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def _is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def create_database() -> bool:
+    """Crear la base de datos de DATABASE_URL conectando a la base de datos 'postgres'.
+
+    Devuelve False si ya existía.
+    """
+    url = make_url(DATABASE_URL)
+    maintenance = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    try:
+        with maintenance.connect() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": url.database}
+            ).first()
+            if exists is None:
+                logger.info("Creando base de datos '%s'", url.database)
+                name = maintenance.dialect.identifier_preparer.quote(url.database)
+                conn.execute(text(f"CREATE DATABASE {name}"))
+                return True
+            return False
+    finally:
+        maintenance.dispose()
+
+
+def _connect(report: dict):
+    try:
+        return engine.connect()
+    except OperationalError:
+        # psycopg no da el SQLSTATE de los errores al conectar: solo tras un fallo se abre
+        # una conexión a 'postgres' para ver si falta la base de datos
+        if not _is_postgres():
+            raise
+        with _phase(report, "create_database"):
+            try:
+                created = create_database()
+            except OperationalError:
+                created = False
+        if not created:
+            raise
+    report["actions"].append("create_database")
+    return engine.connect()
+
+
+def _state(conn) -> Optional[tuple]:
+    """(revisión, existe el usuario inicial) o None si aún no hay esquema ni stamp"""
+    try:
+        row = conn.execute(_STATE, {"email": settings.INITIAL_USER_EMAIL}).first()
+    except DBAPIError:
+        conn.rollback()
+        return None
+    conn.commit()
+    return tuple(row) if row is not None else None
+
+
+@contextmanager
+def _migration_lock(report: dict):
+    """Advisory lock de sesión en una conexión AUTOCOMMIT; cede esa conexión (None en SQLite).
+
+    Se sondea pg_try_advisory_lock sin transacción abierta: un pg_advisory_lock bloqueado
+    dentro de una transacción mantiene un snapshot, y CREATE INDEX CONCURRENTLY del worker
+    que migra esperaría a los que esperan el lock (interbloqueo).
+    """
+    if not _is_postgres():
+        yield None
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        with _phase(report, "lock"):
+            deadline = time.monotonic() + settings.DB_STARTUP_LOCK_TIMEOUT_SECONDS
+            while not lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            ).scalar():
+                if time.monotonic() >= deadline:
+                    raise RuntimeError("Tiempo de espera agotado esperando el lock de migraciones")
+                time.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield lock_conn
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def drop_invalid_indexes(conn) -> list:
+    """Borrar los índices INVALID que deja un CREATE INDEX CONCURRENTLY interrumpido.
+
+    IF NOT EXISTS los daría por creados y la migración no los reconstruiría nunca.
+    conn debe estar en AUTOCOMMIT (DROP INDEX CONCURRENTLY).
+    """
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE NOT i.indisvalid AND n.nspname = current_schema()"
+    )).scalars().all()
+    for name in names:
+        logger.warning("Borrando índice inválido %s (CREATE INDEX CONCURRENTLY interrumpido)", name)
+        quoted = conn.dialect.identifier_preparer.quote(name)
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {quoted}"))
+    return names
+
+
+def _migrate(conn, lock_conn) -> str:
+    """Llevar el esquema a head; devuelve la acción realizada"""
+    from alembic import command
+
+    config = _alembic_config()
+    if not _is_postgres():
+        # Las migraciones usan DDL de PostgreSQL: en SQLite (pruebas, benchmarks) el
+        # esquema sale de los modelos y solo se marca la revisión
+        from app.db.database import Base
+        from app.models import task, user  # noqa: F401
+
+        Base.metadata.create_all(conn)
+        conn.commit()
+        command.stamp(config, "head")
+        return "create_all"
+
+    tables = set(inspect(conn).get_table_names())
+    conn.rollback()
+    if "alembic_version" not in tables and {"users", "tasks"} <= tables:
+        # Esquema creado con create_all / setup_database.py antes de usar Alembic
+        command.stamp(config, BASELINE_REVISION)
+    drop_invalid_indexes(lock_conn)
+    command.upgrade(config, "head")
+    return "upgrade"
+
+
+def create_initial_user(conn) -> bool:
+    """Insertar INITIAL_USER_EMAIL; False si otro proceso lo creó antes"""
+    from app.core.security import get_password_hash
+    from app.models.user import User
+
+    try:
+        conn.execute(User.__table__.insert().values(
+            email=settings.INITIAL_USER_EMAIL,
+            hashed_password=get_password_hash(settings.INITIAL_USER_PASSWORD),
+        ))
+        conn.commit()
+    except IntegrityError:
+        conn.rollback()
+        return False
+    logger.info("Usuario inicial creado: %s", settings.INITIAL_USER_EMAIL)
+    return True
+
+
+def run_startup(phases_ms: Optional[dict] = None, migrate: bool = True) -> dict:
+    """Dejar la base de datos lista para servir y devolver el desglose de tiempos (ms).
+
+    phases_ms: fases ya medidas por quien llama (p. ej. la importación de la aplicación).
+    migrate: aplicar las migraciones pendientes; si es False y faltan, RuntimeError.
+    """
+    global last_report
+
+    report = {"status": "current", "revision": None, "actions": [], "phases_ms": dict(phases_ms or {})}
+    started = time.perf_counter()
+    head = head_revision()
+    with _connect(report) as conn:
+        with _phase(report, "check"):
+            state = _state(conn)
+        if (head is None or state is None or state[0] != head) and not migrate:
+            raise RuntimeError(
+                f"El esquema está en la revisión {state[0] if state else None} y la última es "
+                f"{head}: ejecuta python setup_database.py (o arranca con DB_STARTUP_MIGRATE=true)"
+            )
+        if head is None or state is None or state[0] != head or not state[1]:
+            with _migration_lock(report) as lock_conn:
+                # Otro worker pudo terminar el trabajo mientras se esperaba el lock
+                state = _state(conn)
+                if head is None or state is None or state[0] != head:
+                    with _phase(report, "migrate"):
+                        report["actions"].append(_migrate(conn, lock_conn))
+                    state = _state(conn)
+                if state is None:
+                    raise RuntimeError("El esquema no tiene la tabla alembic_version tras migrar")
+                if not state[1]:
+                    with _phase(report, "initial_user"):
+                        if create_initial_user(conn):
+                            report["actions"].append("initial_user")
+        report["revision"] = state[0]
+    if report["actions"]:
+        report["status"] = "updated"
+    report["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    last_report = report
+    logger.info(
+        "Arranque de base de datos (%s, revisión %s): %s; total %.1f ms",
+        report["status"], report["revision"],
+        ", ".join(f"{name} {ms:.1f} ms" for name, ms in report["phases_ms"].items()),
+        report["total_ms"]
+    )
+    return report
@@ -1,12 +1,42 @@
+import time
+
+# Inicio de la importación de la aplicación (desglose del tiempo de arranque)
+_import_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, tasks
+from app.api import auth, health, metrics, monitoring, tasks
+from app.core.config import settings
+from app.core.serialization import default_response_class
+from app.db.database import async_engine, engine
+from app.db.instrumentation import QueryStatsMiddleware
+from app.db.startup import run_startup
+from app.services.health_service import database_probe
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Esquema y usuario inicial: una consulta si ya están al día
+    if settings.DB_STARTUP_CHECK:
+        await asyncio.to_thread(run_startup, {"imports": import_ms}, settings.DB_STARTUP_MIGRATE)
+    # Sonda de readiness en segundo plano
+    database_probe.start()
+    yield
+    await database_probe.stop()
+    if settings.METRICS_ENABLED:
+        from app.core.metrics import mark_process_dead
+
+        mark_process_dead()
 
 
 app = FastAPI(
     title="Technical Test API",
     description="API REST con FastAPI y PostgreSQL",
     version="1.0.0",
+    default_response_class=default_response_class(),
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -18,9 +48,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sentencias SQL y tiempo de base de datos por petición
+app.add_middleware(QueryStatsMiddleware)
+
+# Perfilado bajo demanda (sin coste si no está activado)
+if settings.PROFILING_ENABLED:
+    from app.core.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+
+# Métricas por ruta (último middleware añadido: envuelve a todos los demás)
+if settings.METRICS_ENABLED:
+    from app.core.metrics import MetricsMiddleware, instrument_engine
+
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine, "sync")
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine, "async")
+
 # Incluir routers
+app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(tasks.router)
+app.include_router(monitoring.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 @app.get("/")
 def read_root():
@@ -34,10 +86,6 @@ def read_root():
         }
     }
 
-@app.get("/health")
-def health_check():
-    """Endpoint para verificar el estado de la API"""
-    return {
-        "status": "healthy",
-        "database": "connected"
-    }
\ No newline at end of file
+
+# Routers, modelos y middlewares ya importados
+import_ms = round((time.perf_counter() - _import_started) * 1000, 2)
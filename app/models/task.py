@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import Column, DDL, Integer, String, Text, DateTime, Enum, Index, event
 from sqlalchemy.sql import func
 import enum
 from app.db.database import Base
@@ -12,9 +12,19 @@ class TaskStatus(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Índices (columna de orden, id) para ORDER BY y paginación por cursor;
+    # cualquier cambio aquí necesita su migración en alembic/versions
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tasks_title_id", "title", "id"),
+        # LIKE 'prefijo%' con cualquier collation
+        Index("ix_tasks_title_pattern", "title", postgresql_ops={"title": "varchar_pattern_ops"}),
+        Index("ix_tasks_updated_at", "updated_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(200), nullable=False, index=True)
+    title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(
         Enum(
@@ -27,5 +37,20 @@ class Task(Base):
         nullable=False,
         index=True
     )
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+# Búsqueda de texto (solo PostgreSQL): columna generada tsvector con índice GIN e
+# índice de trigramas sobre title. No se mapea en el modelo para que siga siendo portable;
+# las bases de datos existentes la reciben con la migración 0003
+TASK_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_title_trgm ON tasks USING gin (title gin_trgm_ops)",
+)
+
+for _statement in TASK_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
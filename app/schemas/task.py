@@ -1,9 +1,18 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
+import enum
+from app.core.config import settings
 from app.models.task import TaskStatus
 
 
+class CountMode(str, enum.Enum):
+    EXACT = "exact"          # SELECT count(*) adicional
+    WINDOW = "window"        # count(*) OVER () en la misma consulta
+    ESTIMATED = "estimated"  # estadísticas del planificador, con caché
+    NONE = "none"            # sin total, solo has_next
+
+
 class TaskBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = None
@@ -29,9 +38,126 @@ class Task(TaskBase):
         from_attributes = True
 
 
+class TaskSearchResult(Task):
+    rank: float
+
+
+class TaskSearchResponse(BaseModel):
+    items: list[TaskSearchResult]
+    page: int
+    page_size: int
+    has_next: bool = False
+
+
 class TaskListResponse(BaseModel):
     items: list[Task]
-    total: int
-    page: int
+    # total y total_pages son None con count=none; page es None en el modo cursor
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None
+
+
+class BulkMode(str, enum.Enum):
+    ALL_OR_NOTHING = "all_or_nothing"  # cualquier item inválido rechaza la petición
+    PER_ITEM = "per_item"              # se crean los válidos y se informan los errores
+
+
+class TaskBulkCreate(BaseModel):
+    # Cada item se valida contra TaskCreate en el servicio, para informar errores por índice
+    items: list[Any] = Field(..., min_length=1, max_length=settings.TASK_BULK_MAX_ITEMS)
+    mode: BulkMode = BulkMode.ALL_OR_NOTHING
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class TaskBulkCreateResponse(BaseModel):
+    created: list[Task]
+    errors: list[TaskBulkError] = []
+
+
+
+class TaskSort(str, enum.Enum):
+    # Cada orden tiene un índice (columna, id) que sirve también al modo cursor
+    CREATED_AT_DESC = "-created_at"
+    CREATED_AT = "created_at"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+    ID = "id"
+    ID_DESC = "-id"
+
+
+class TaskFileFormat(str, enum.Enum):
+    """Formato de los ficheros de exportación e importación"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TaskFilter(BaseModel):
+    status: Optional[list[TaskStatus]] = None
+    # Rangos semiabiertos [desde, hasta)
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    updated_from: Optional[datetime] = None
+    updated_to: Optional[datetime] = None
+    title_prefix: Optional[str] = Field(None, min_length=1, max_length=200)
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+class TaskBulkSelection(BaseModel):
+    """Tareas afectadas por una operación masiva: lista de ids o filtro"""
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=settings.TASK_BULK_MAX_IDS)
+    filter: Optional[TaskFilter] = None
+    return_ids: bool = False
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Indique ids o filter (solo uno de los dos)")
+        # Un filtro vacío afectaría a toda la tabla
+        if self.filter is not None and self.filter.is_empty():
+            raise ValueError("filter necesita al menos un criterio")
+        return self
+
+
+class TaskBulkChanges(TaskUpdate):
+    """Cambios de una actualización masiva: van directos a un UPDATE sin pasar por el modelo"""
+
+    @model_validator(mode="after")
+    def check_not_null(self):
+        # title y status son NOT NULL: un null explícito haría fallar el UPDATE
+        nulls = [name for name in ("title", "status") if name in self.model_fields_set and getattr(self, name) is None]
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} no admite null")
+        return self
+
+
+class TaskBulkUpdate(TaskBulkSelection):
+    changes: TaskBulkChanges
+
+
+class TaskBulkResult(BaseModel):
+    affected: int
+    ids: Optional[list[int]] = None
+
+
+
+class TaskImportError(BaseModel):
+    line: int
+    errors: list[dict[str, Any]]
+
+
+class TaskImportResult(BaseModel):
+    inserted: int
+    rejected: int
+    # Solo los primeros TASK_IMPORT_MAX_ERRORS rechazos
+    errors: list[TaskImportError] = []
+    seconds: float
+    rows_per_second: float
@@ -18,6 +18,15 @@ class User(UserBase):
         from_attributes = True
 
 
+class CurrentUser(BaseModel):
+    """Usuario autenticado de la petición (lo que se guarda en la caché)"""
+    id: int
+    email: str
+
+    class Config:
+        from_attributes = True
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
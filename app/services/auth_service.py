@@ -1,52 +1,122 @@
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.models.user import User
-from app.core.security import verify_password, create_access_token, decode_access_token
-from app.db.database import get_db
-from datetime import timedelta
+from app.schemas.user import CurrentUser
+from app.core.cache import TTLCache
+from app.core.metrics import record_auth_failure
+from app.core.security import (
+    PasswordHasherBusy,
+    decode_access_token,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async
+)
+from app.db.database import get_session, run_db
 from app.core.config import settings
 
 security = HTTPBearer()
 
+# Usuarios autenticados por subject del token (email), por proceso
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = db.query(User).filter(User.email == email).first()
+
+def invalidate_user(email: str):
+    """Descartar el usuario cacheado; llamar tras cambios hechos fuera del ORM"""
+    _user_cache.delete(email)
+
+
+def clear_user_cache():
+    _user_cache.clear()
+
+
+def user_cache_stats() -> dict:
+    return _user_cache.stats()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # Si el email cambió, la entrada está guardada bajo el valor anterior
+    for email in inspect(target).attrs.email.history.deleted:
+        invalidate_user(email)
+    invalidate_user(target.email)
+
+
+def get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def update_password_hash(db: Session, user: User, hashed_password: str) -> User:
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def token_claims(user: User) -> dict:
+    """Claims del token de acceso; uid y ver permiten el modo stateless"""
+    return {"sub": user.email, "uid": user.id, "ver": settings.AUTH_TOKEN_VERSION}
+
+
+async def authenticate_user(db, email: str, password: str):
+    user = await run_db(db, get_user_by_email, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    # bcrypt es costoso en CPU: va al pool acotado de security (PasswordHasherBusy si está lleno)
+    if not await verify_password_async(password, user.hashed_password):
         return False
+
+    # Cambios de BCRYPT_ROUNDS se aplican sin reiniciar contraseñas
+    if password_needs_rehash(user.hashed_password):
+        try:
+            hashed_password = await get_password_hash_async(password)
+        except PasswordHasherBusy:
+            # Pool saturado: el rehash queda para el próximo login
+            return user
+        user = await run_db(db, update_password_hash, user, hashed_password)
     return user
 
 
-def get_current_user(
+def _credentials_exception(reason: str, detail: str = "Could not validate credentials"):
+    record_auth_failure(reason)
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+    db = Depends(get_session)
+) -> CurrentUser:
     token = credentials.credentials
     payload = decode_access_token(token)
     
     if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception("invalid_token")
     
     email: str = payload.get("sub")
     if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception("invalid_token")
+
+    if settings.AUTH_STATELESS:
+        if "ver" in payload and payload["ver"] != settings.AUTH_TOKEN_VERSION:
+            raise _credentials_exception("token_version")
+        # Tokens emitidos antes de incluir uid se validan contra la base de datos
+        if payload.get("uid") is not None:
+            return CurrentUser(id=payload["uid"], email=email)
+
+    user = _user_cache.get(email)
+    if user is not None:
+        return user
     
-    return user
\ No newline at end of file
+    db_user = await run_db(db, get_user_by_email, email)
+    if db_user is None:
+        raise _credentials_exception("user_not_found", "User not found")
+
+    user = CurrentUser.model_validate(db_user)
+    _user_cache.set(email, user)
+    return user
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.database import DATABASE_URL, pool_status
+
+logger = logging.getLogger(__name__)
+
+
+def _probe_engine():
+    """Engine propio de una sola conexión: la sonda no compite con el pool de la aplicación"""
+    options = {
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+        "pool_pre_ping": False,
+    }
+    if DATABASE_URL.startswith("sqlite"):
+        return create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    return create_engine(
+        DATABASE_URL,
+        connect_args={"connect_timeout": max(1, int(settings.HEALTH_PROBE_TIMEOUT_SECONDS))},
+        **options
+    )
+
+
+def _pool_saturation(pools: dict) -> float:
+    """Fracción de la capacidad (pool_size + max_overflow) en uso en el pool más cargado"""
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if capacity <= 0:
+        return 0.0
+    return max((pool["checked_out"] / capacity for pool in pools.values()), default=0.0)
+
+
+class DatabaseProbe:
+    """Comprobación periódica de la base de datos con el último resultado cacheado.
+
+    /health/ready solo lee ese resultado: un balanceador puede consultarlo con la
+    frecuencia que quiera sin generar carga en la base de datos.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.result: dict = {"status": "starting", "ready": False}
+        self.checked_at: Optional[float] = None
+        self._engine = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _round_trip(self) -> float:
+        if self._engine is None:
+            self._engine = _probe_engine()
+        start = time.perf_counter()
+        with self._engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return time.perf_counter() - start
+
+    async def check(self) -> dict:
+        pools = pool_status()
+        saturation = _pool_saturation(pools)
+        result = {
+            "pool": pools,
+            "pool_saturation": round(saturation, 3),
+        }
+        try:
+            rtt = await asyncio.wait_for(asyncio.to_thread(self._round_trip), self.timeout)
+        except Exception as exc:
+            result.update(database="error", error=f"{type(exc).__name__}: {exc}"[:200], rtt_ms=None)
+            problems = ["database"]
+            if self._engine is not None:
+                # Conexión posiblemente rota: la siguiente comprobación abre otra
+                self._engine.dispose()
+        else:
+            result.update(database="ok", rtt_ms=round(rtt * 1000, 2))
+            problems = []
+            if rtt * 1000 > settings.HEALTH_MAX_DB_RTT_MS:
+                problems.append("database_latency")
+        if saturation >= settings.HEALTH_MAX_POOL_SATURATION:
+            problems.append("pool_saturation")
+
+        result["ready"] = not problems
+        result["status"] = "ready" if not problems else "not_ready"
+        if problems:
+            result["problems"] = problems
+            if self.result.get("ready"):
+                logger.warning("Readiness: %s", ", ".join(problems))
+        self.result = result
+        self.checked_at = time.monotonic()
+        return result
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Error en la comprobación de readiness")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._engine is not None:
+            await asyncio.to_thread(self._engine.dispose)
+
+    def snapshot(self) -> dict:
+        """Último resultado; deja de estar listo si la sonda lleva demasiado sin actualizarse"""
+        result = dict(self.result)
+        if self.checked_at is not None:
+            age = time.monotonic() - self.checked_at
+            result["age_seconds"] = round(age, 2)
+            if age > 3 * self.interval + self.timeout:
+                result.update(ready=False, status="not_ready", problems=["stale_probe"])
+        return result
+
+
+database_probe = DatabaseProbe(
+    settings.HEALTH_PROBE_INTERVAL_SECONDS, settings.HEALTH_PROBE_TIMEOUT_SECONDS
+)
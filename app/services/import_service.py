@@ -0,0 +1,145 @@
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from app.core.config import settings
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskFileFormat, TaskImportError
+from app.services.task_cache import invalidate_tasks
+import codecs
+import csv
+import json
+import time
+
+def _iter_lines(stream, chunk_size: int):
+    """Líneas de un fichero binario UTF-8 leyendo bloques de chunk_size bytes"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        pending += decoder.decode(chunk, final=not chunk)
+        parts = pending.split("\n")
+        pending = parts.pop()
+        for part in parts:
+            yield part + "\n"
+        if not chunk:
+            break
+    if pending:
+        yield pending
+
+
+def _iter_records(stream, file_format: TaskFileFormat, chunk_size: int):
+    """Pares (línea, dict) del fichero; los errores de formato se devuelven como ValueError"""
+    lines = _iter_lines(stream, chunk_size)
+    if file_format == TaskFileFormat.CSV:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # Celdas vacías: se aplican los valores por defecto de TaskCreate
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ""}
+    else:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as exc:
+                yield line_number, exc
+
+
+def _storage_errors(task: TaskCreate) -> list:
+    """Textos válidos para Pydantic que la base de datos rechazaría (y con ellos todo el COPY)"""
+    errors = []
+    for field in ("title", "description"):
+        value = getattr(task, field)
+        if value is None:
+            continue
+        if "\x00" in value:
+            errors.append({"type": "nul_character", "loc": [field], "msg": "El texto contiene el carácter NUL"})
+            continue
+        try:
+            value.encode("utf-8")
+        except UnicodeEncodeError:
+            errors.append({"type": "invalid_unicode", "loc": [field], "msg": "El texto no es UTF-8 válido"})
+    return errors
+
+
+def _iter_valid_tasks(stream, file_format: TaskFileFormat, chunk_size: int, report: dict):
+    """Validar cada registro contra TaskCreate; los inválidos se acumulan en report"""
+    for line_number, record in _iter_records(stream, file_format, chunk_size):
+        if isinstance(record, ValueError):
+            _reject(report, line_number, [{"type": "json_invalid", "msg": str(record)}])
+            continue
+        try:
+            task = TaskCreate.model_validate(record)
+        except ValidationError as exc:
+            _reject(report, line_number, exc.errors(include_url=False, include_context=False))
+            continue
+        errors = _storage_errors(task)
+        if errors:
+            _reject(report, line_number, errors)
+            continue
+        yield line_number, task
+
+
+def _reject(report: dict, line_number: int, errors: list):
+    report["rejected"] += 1
+    if len(report["errors"]) < settings.TASK_IMPORT_MAX_ERRORS:
+        report["errors"].append(TaskImportError(line=line_number, errors=errors))
+
+
+def _load_with_copy(db: Session, tasks) -> int:
+    """COPY FROM STDIN directamente a tasks, en orden de línea.
+
+    Las filas ya están validadas (TaskCreate y _storage_errors): una tabla intermedia solo
+    escribiría todo dos veces. El estado se convierte a taskstatus en la entrada del COPY.
+    """
+    driver_connection = db.connection().connection.driver_connection
+    inserted = 0
+    with driver_connection.cursor() as cursor:
+        with cursor.copy("COPY tasks (title, description, status) FROM STDIN") as copy:
+            for _, task in tasks:
+                copy.write_row((task.title, task.description, task.status.value))
+                inserted += 1
+    return inserted
+
+
+def _load_with_insert(db: Session, tasks, batch_size: int = 1000) -> int:
+    """Alternativa sin COPY (p. ej. SQLite): INSERT por lotes"""
+    inserted = 0
+    batch = []
+    for _, task in tasks:
+        batch.append(task.model_dump())
+        if len(batch) == batch_size:
+            db.execute(insert(Task.__table__), batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(Task.__table__), batch)
+        inserted += len(batch)
+    return inserted
+
+
+def import_tasks(db: Session, stream, file_format: TaskFileFormat, chunk_size: int = None) -> dict:
+    """Importar tareas desde un fichero CSV o NDJSON sin cargarlo entero en memoria.
+
+    Lectura, validación y carga van en una sola pasada; todo se confirma en una transacción.
+    """
+    start = time.perf_counter()
+    report = {"rejected": 0, "errors": []}
+    tasks = _iter_valid_tasks(stream, file_format, chunk_size or settings.TASK_IMPORT_CHUNK_SIZE, report)
+
+    if db.get_bind().dialect.name == "postgresql":
+        inserted = _load_with_copy(db, tasks)
+    else:
+        inserted = _load_with_insert(db, tasks)
+    db.commit()
+    invalidate_tasks()
+
+    seconds = time.perf_counter() - start
+    processed = inserted + report["rejected"]
+    return {
+        "inserted": inserted,
+        "rejected": report["rejected"],
+        "errors": report["errors"],
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(processed / seconds, 1) if seconds > 0 else 0.0
+    }
@@ -0,0 +1,153 @@
+import hashlib
+import logging
+from threading import Lock
+from typing import Callable, Optional
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend
+from app.core.config import settings
+from app.schemas.task import Task as TaskSchema, TaskListResponse
+
+logger = logging.getLogger(__name__)
+
+# Las claves llevan un contador de generación que se lee antes de cargar de la base de
+# datos: una escritura confirmada lo sube, y una lectura que cargó antes de la escritura
+# guarda su resultado en una clave de la generación anterior que ya nadie consulta.
+# Cada tarea tiene su contador (invalidación por id); las páginas de listado dependen
+# de cualquier escritura y comparten uno. Los contadores caducan COUNTER_TTL_FACTOR veces
+# el TTL de las entradas después de su último incremento: cuando uno vuelve a 0 ya no
+# queda ninguna entrada de sus generaciones anteriores.
+_PREFIX = "tasks:"
+_LIST_GENERATION = _PREFIX + "gen:list"
+COUNTER_TTL_FACTOR = 10
+
+
+class TaskCache:
+    """Caché de lectura de tareas y páginas de listado sobre un backend intercambiable"""
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = Lock()
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _failed(self, operation: str, exc: Exception):
+        # Un backend caído no debe tumbar las lecturas: se sirve desde la base de datos
+        with self._lock:
+            self.errors += 1
+        logger.warning("Caché de tareas: fallo en %s (%s)", operation, exc)
+
+    def _item_generation(self, task_id: int) -> str:
+        return f"{_PREFIX}gen:item:{task_id}"
+
+    def _item_key(self, task_id: int) -> str:
+        generation = self.backend.get_counter(self._item_generation(task_id))
+        return f"{_PREFIX}item:{task_id}:{generation}"
+
+    def _list_key(self, params: dict) -> str:
+        generation = self.backend.get_counter(_LIST_GENERATION)
+        raw = repr(sorted(params.items())).encode("utf-8")
+        return f"{_PREFIX}list:{generation}:{hashlib.blake2b(raw, digest_size=16).hexdigest()}"
+
+    def get_task(self, task_id: int, load: Callable) -> Optional[TaskSchema]:
+        try:
+            key = self._item_key(task_id)
+            raw = self.backend.get(key)
+        except Exception as exc:
+            self._failed("get", exc)
+            return load()
+        if raw is not None:
+            self._count(True)
+            return TaskSchema.model_validate_json(raw)
+
+        self._count(False)
+        db_task = load()
+        if db_task is None:
+            return None
+        task = TaskSchema.model_validate(db_task)
+        try:
+            self.backend.set(key, task.model_dump_json().encode("utf-8"), self.ttl)
+        except Exception as exc:
+            self._failed("set", exc)
+        return task
+
+    def get_tasks(self, params: dict, load: Callable) -> dict:
+        try:
+            key = self._list_key(params)
+            raw = self.backend.get(key)
+        except Exception as exc:
+            self._failed("get", exc)
+            return load()
+        if raw is not None:
+            self._count(True)
+            return dict(TaskListResponse.model_validate_json(raw))
+
+        self._count(False)
+        page = TaskListResponse.model_validate(load(), from_attributes=True)
+        try:
+            self.backend.set(key, page.model_dump_json().encode("utf-8"), self.ttl)
+        except Exception as exc:
+            self._failed("set", exc)
+        return dict(page)
+
+    def invalidate(self, task_ids=()):
+        """Descartar las tareas indicadas y todas las páginas de listado"""
+        try:
+            self.backend.incr_many(
+                [self._item_generation(task_id) for task_id in task_ids] + [_LIST_GENERATION]
+            )
+        except Exception as exc:
+            self._failed("invalidate", exc)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "errors": self.errors,
+                "ttl_seconds": self.ttl,
+            }
+        try:
+            stats.update(self.backend.stats())
+        except Exception as exc:
+            self._failed("stats", exc)
+        return stats
+
+
+def build_task_cache() -> Optional[TaskCache]:
+    """Crear la caché según TASK_CACHE_BACKEND; None si está desactivada"""
+    counter_ttl = settings.TASK_CACHE_TTL_SECONDS * COUNTER_TTL_FACTOR
+    if settings.TASK_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(
+            settings.TASK_CACHE_MAX_ITEMS, settings.TASK_CACHE_TTL_SECONDS, counter_ttl
+        )
+    elif settings.TASK_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend.from_url(settings.REDIS_URL, counter_ttl)
+    else:
+        return None
+    return TaskCache(backend, settings.TASK_CACHE_TTL_SECONDS)
+
+
+task_cache = build_task_cache()
+
+
+def invalidate_tasks(task_ids=()):
+    """Invalidar tras una escritura ya confirmada; sin ids solo se descartan los listados"""
+    if task_cache is not None:
+        task_cache.invalidate(task_ids)
+
+
+def task_cache_stats() -> dict:
+    if task_cache is None:
+        return {"backend": "none"}
+    return task_cache.stats()
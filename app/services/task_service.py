@@ -1,58 +1,630 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import DateTime, Text, case, cast, delete, func, insert, literal, literal_column, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import TSVECTOR, aggregate_order_by
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.etag import same_version
+from app.core.serialization import TASK_FIELDS, dump_task_page, splice_task_page
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import CountMode, TaskBulkChanges, TaskBulkError, TaskCreate, TaskFilter, TaskSort, TaskUpdate
+from app.services.task_cache import invalidate_tasks, task_cache
 from typing import List, Optional
+from datetime import datetime
 from math import ceil
+from threading import Lock
+import base64
+import json
+import time
 
 
-def create_task(db: Session, task: TaskCreate) -> Task:
-    db_task = Task(**task.model_dump())
-    db.add(db_task)
+class InvalidCursorError(ValueError):
+    """Cursor de paginación mal formado o de otro orden"""
+
+
+# Columna de orden y si es descendente; el id desempata (salvo cuando es la propia columna)
+_SORT_SPEC = {
+    TaskSort.CREATED_AT_DESC: (Task.created_at, True),
+    TaskSort.CREATED_AT: (Task.created_at, False),
+    TaskSort.TITLE: (Task.title, False),
+    TaskSort.TITLE_DESC: (Task.title, True),
+    TaskSort.ID: (Task.id, False),
+    TaskSort.ID_DESC: (Task.id, True),
+}
+
+
+def encode_cursor(sort: TaskSort, task) -> str:
+    """Generar un cursor opaco con el orden y la clave (columna, id) de la última fila"""
+    column, _ = _SORT_SPEC[sort]
+    return _encode_cursor_key(sort, getattr(task, column.key), task.id)
+
+
+def _encode_cursor_key(sort: TaskSort, value, task_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort.value, value, task_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: TaskSort) -> tuple:
+    """Recuperar (valor, id) de un cursor generado por encode_cursor con el mismo orden"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, task_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if cursor_sort != sort.value or not isinstance(task_id, int):
+            raise ValueError("orden distinto")
+        column, _ = _SORT_SPEC[sort]
+        if column is Task.created_at:
+            value = datetime.fromisoformat(value)
+        elif column is Task.title and not isinstance(value, str):
+            raise ValueError("título inválido")
+        return value, task_id
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+
+def create_task(db: Session, task: TaskCreate):
+    """INSERT ... RETURNING: la fila creada (con id y created_at) en un solo viaje"""
+    table = Task.__table__
+    row = db.execute(insert(table).values(**task.model_dump()).returning(*table.c)).one()
     db.commit()
-    db.refresh(db_task)
-    return db_task
+    invalidate_tasks()
+    return row
 
 
-def get_task(db: Session, task_id: int) -> Optional[Task]:
+def validate_task_items(items: list) -> tuple[list[TaskCreate], list[TaskBulkError]]:
+    """Validar todos los items antes de tocar la base de datos"""
+    tasks = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            tasks.append(TaskCreate.model_validate(item))
+        except ValidationError as exc:
+            errors.append(TaskBulkError(
+                index=index, errors=exc.errors(include_url=False, include_context=False)
+            ))
+    return tasks, errors
+
+
+def create_tasks_bulk(db: Session, tasks: list[TaskCreate]):
+    """Insertar varias tareas con INSERT ... VALUES (...), (...) RETURNING en un solo viaje"""
+    if not tasks:
+        return []
+    table = Task.__table__
+    rows = db.execute(
+        insert(table).returning(*table.c, sort_by_parameter_order=True),
+        [task.model_dump() for task in tasks]
+    ).all()
+    db.commit()
+    invalidate_tasks()
+    return rows
+
+
+def _load_task(db: Session, task_id: int) -> Optional[Task]:
     return db.query(Task).filter(Task.id == task_id).first()
 
 
-def get_tasks(db: Session, page: int = 1, page_size: int = 10):
-    skip = (page - 1) * page_size
-    
-    tasks = db.query(Task).order_by(Task.created_at.desc()).offset(skip).limit(page_size).all()
-    total = db.query(func.count(Task.id)).scalar()
-    total_pages = ceil(total / page_size) if total > 0 else 0
-    
+def get_task(db: Session, task_id: int) -> Optional[Task]:
+    # Con caché activa devuelve un schemas.Task (igual respuesta, sin consultar la BD)
+    if task_cache is None:
+        return _load_task(db, task_id)
+    return task_cache.get_task(task_id, lambda: _load_task(db, task_id))
+
+
+def filter_conditions(filters: Optional[TaskFilter]) -> list:
+    """Condiciones WHERE equivalentes a un TaskFilter"""
+    conditions = []
+    if filters is None:
+        return conditions
+    if filters.status:
+        conditions.append(Task.status.in_(filters.status))
+    if filters.created_from is not None:
+        conditions.append(Task.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        conditions.append(Task.created_at < filters.created_to)
+    if filters.updated_from is not None:
+        conditions.append(Task.updated_at >= filters.updated_from)
+    if filters.updated_to is not None:
+        conditions.append(Task.updated_at < filters.updated_to)
+    if filters.title_prefix:
+        # LIKE 'prefijo%' servido por ix_tasks_title_pattern
+        conditions.append(Task.title.startswith(filters.title_prefix, autoescape=True))
+    return conditions
+
+
+def _exact_count(db: Session, conditions: list) -> int:
+    return db.query(func.count(Task.id)).filter(*conditions).scalar()
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) de una SELECT, con sus parámetros ligados normalmente"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+_estimated_count_cache: dict[str, tuple[int, float]] = {}
+_estimated_count_lock = Lock()
+
+
+def _estimated_count(db: Session, filters: Optional[TaskFilter], conditions: list) -> int:
+    """Total aproximado según el planificador de PostgreSQL, con caché por filtro"""
+    key = filters.model_dump_json(exclude_none=True) if conditions else Task.__tablename__
+    now = time.monotonic()
+    with _estimated_count_lock:
+        cached = _estimated_count_cache.get(key)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    estimate = None
+    if db.get_bind().dialect.name == "postgresql":
+        if conditions:
+            plan = db.execute(_Explain(select(Task.id).where(*conditions))).scalar()
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+        else:
+            estimate = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": Task.__tablename__}
+            ).scalar()
+    # reltuples vale -1 mientras la tabla no se ha analizado
+    if estimate is None or estimate < 0:
+        estimate = _exact_count(db, conditions)
+
+    with _estimated_count_lock:
+        if len(_estimated_count_cache) >= 1024:
+            _estimated_count_cache.clear()
+        _estimated_count_cache[key] = (estimate, now + settings.TASK_COUNT_CACHE_SECONDS)
+    return estimate
+
+
+def get_tasks(
+    db: Session,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: Optional[CountMode] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT_DESC,
+    as_rows: bool = False
+):
+    """Página de tareas; con as_rows los items son filas Core en lugar de objetos ORM"""
+    if task_cache is None:
+        return _load_tasks(db, page, page_size, cursor, count_mode, filters, sort, as_rows)
+    params = {
+        "page": page,
+        "page_size": page_size,
+        "cursor": cursor,
+        "count": count_mode.value if count_mode is not None else None,
+        "filters": filters.model_dump_json() if filters is not None else None,
+        "sort": sort.value,
+    }
+    return task_cache.get_tasks(
+        params, lambda: _load_tasks(db, page, page_size, cursor, count_mode, filters, sort, as_rows)
+    )
+
+
+def _resolve_count_mode(count_mode: Optional[CountMode], cursor: Optional[str]) -> CountMode:
+    # El modo cursor no cuenta salvo que se pida explícitamente
+    if count_mode is None:
+        return CountMode.NONE if cursor is not None else CountMode(settings.TASK_COUNT_MODE)
+    # Con el filtro del cursor count(*) OVER () solo contaría lo que queda: se cuenta aparte
+    if count_mode == CountMode.WINDOW and cursor is not None:
+        return CountMode.EXACT
+    return count_mode
+
+
+def _order_keys(sort: TaskSort, columns=None) -> list:
+    """ORDER BY del orden pedido (columna, id), sobre la tabla o sobre una subconsulta"""
+    column, descending = _SORT_SPEC[sort]
+    keys = (column,) if column is Task.id else (column, Task.id)
+    if columns is not None:
+        keys = tuple(columns[key.key] for key in keys)
+    return [key.desc() if descending else key.asc() for key in keys]
+
+
+def _sqlite_timestamp(expression):
+    return func.strftime("%Y-%m-%d %H:%M:%f", expression)
+
+
+def _cursor_condition(cursor: str, sort: TaskSort, dialect: str):
+    # Comparación de filas sobre el índice (columna, id) del orden,
+    # el coste no depende de la profundidad de la página
+    column, descending = _SORT_SPEC[sort]
+    value, last_id = decode_cursor(cursor, sort)
+    if column is Task.id:
+        position, after = Task.id, last_id
+    else:
+        # El valor va con el tipo de la columna: en PostgreSQL se compara como
+        # timestamptz, sin pasar por la zona horaria de la sesión
+        bound = literal(value, column.type)
+        if column is Task.created_at and dialect == "sqlite":
+            # SQLite guarda texto: CURRENT_TIMESTAMP sin fracción y el parámetro con
+            # .000000 no se ordenan igual como cadenas; se normalizan ambos lados
+            column, bound = _sqlite_timestamp(column), _sqlite_timestamp(bound)
+        position, after = tuple_(column, Task.id), tuple_(bound, last_id)
+    return position < after if descending else position > after
+
+
+def _page_total(
+    db: Session,
+    count_mode: CountMode,
+    filters: Optional[TaskFilter],
+    conditions: list,
+    seen: int
+) -> Optional[int]:
+    """Total según el modo; seen son las filas que ya se sabe que existen (offset + página)"""
+    if count_mode in (CountMode.EXACT, CountMode.WINDOW):
+        return _exact_count(db, conditions)
+    if count_mode == CountMode.ESTIMATED:
+        return max(_estimated_count(db, filters, conditions), seen)
+    return None
+
+
+def _total_pages(total: Optional[int], page_size: int) -> Optional[int]:
+    if total is None:
+        return None
+    return ceil(total / page_size) if total > 0 else 0
+
+
+def _load_tasks(
+    db: Session,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    count_mode: Optional[CountMode],
+    filters: Optional[TaskFilter],
+    sort: TaskSort,
+    as_rows: bool = False
+):
+    count_mode = _resolve_count_mode(count_mode, cursor)
+    use_window = count_mode == CountMode.WINDOW
+    conditions = filter_conditions(filters)
+
+    # Las filas Core evitan construir objetos ORM (identity map, estado) que no se van a modificar
+    entities = tuple(Task.__table__.c) if as_rows else (Task,)
+    if use_window:
+        entities += (func.count().over(),)
+    query = db.query(*entities).filter(*conditions).order_by(*_order_keys(sort))
+
+    if cursor is not None:
+        query = query.filter(_cursor_condition(cursor, sort, db.get_bind().dialect.name))
+        offset = 0
+    else:
+        offset = (page - 1) * page_size
+        query = query.offset(offset)
+
+    # Se pide una fila extra para saber si hay página siguiente
+    rows = query.limit(page_size + 1).all()
+
+    total = None
+    if use_window:
+        if rows:
+            total = rows[0][-1]
+        if not as_rows:
+            rows = [row[0] for row in rows]
+
+    has_next = len(rows) > page_size
+    tasks = rows[:page_size]
+    next_cursor = encode_cursor(sort, tasks[-1]) if has_next else None
+
+    # Una página fuera de rango no trae filas con las que leer el total de la ventana
+    if total is None:
+        total = _page_total(db, count_mode, filters, conditions, offset + len(tasks))
+
     return {
         "items": tasks,
         "total": total,
+        "page": page if cursor is None else None,
+        "page_size": page_size,
+        "total_pages": _total_pages(total, page_size),
+        "has_next": has_next,
+        "next_cursor": next_cursor
+    }
+
+
+def render_tasks_json(
+    db: Session,
+    page: int = 1,
+    page_size: int = 10,
+    cursor: Optional[str] = None,
+    count_mode: Optional[CountMode] = None,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT_DESC
+) -> bytes:
+    """Cuerpo JSON de una página de tareas sin pasar por los modelos de respuesta.
+
+    Con TASK_LIST_RENDER=json_agg (PostgreSQL, sin caché de tareas) el array de items
+    lo construye la base de datos y se copia tal cual a la respuesta.
+    """
+    if (
+        settings.TASK_LIST_RENDER == "json_agg"
+        and task_cache is None
+        and db.get_bind().dialect.name == "postgresql"
+    ):
+        return _render_tasks_json_agg(db, page, page_size, cursor, count_mode, filters, sort)
+    return dump_task_page(get_tasks(db, page, page_size, cursor, count_mode, filters, sort, as_rows=True))
+
+
+def _json_timestamp(column):
+    """Fecha en el formato de Pydantic: UTC con 'Z' y microsegundos solo si no son cero"""
+    utc = column.op("AT TIME ZONE")(literal("UTC"))
+    fraction = case((func.date_trunc("second", column) == column, ""), else_=func.to_char(utc, ".US"))
+    return func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text) + fraction + "Z"
+
+
+def _render_tasks_json_agg(
+    db: Session,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    count_mode: Optional[CountMode],
+    filters: Optional[TaskFilter],
+    sort: TaskSort
+) -> bytes:
+    count_mode = _resolve_count_mode(count_mode, cursor)
+    conditions = filter_conditions(filters)
+    statement = select(*Task.__table__.c).where(*conditions).order_by(*_order_keys(sort))
+    if cursor is not None:
+        statement = statement.where(_cursor_condition(cursor, sort, "postgresql"))
+        offset = 0
+    else:
+        offset = (page - 1) * page_size
+        statement = statement.offset(offset)
+    fetched = statement.limit(page_size + 1).subquery("fetched")
+    # row_number sobre las filas ya limitadas para separar la fila extra de has_next
+    numbered = select(
+        fetched, func.row_number().over(order_by=_order_keys(sort, fetched.c)).label("rn")
+    ).subquery("page")
+
+    in_page = numbered.c.rn <= page_size
+    # Mismo orden de campos y formato de fechas que schemas.Task
+    item = func.json_build_object(*(
+        part for field in TASK_FIELDS for part in (
+            literal(field),
+            _json_timestamp(numbered.c[field]) if isinstance(numbered.c[field].type, DateTime) else numbered.c[field]
+        )
+    ))
+    column, _ = _SORT_SPEC[sort]
+    items_json, fetched_count, last_key = db.execute(select(
+        cast(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(item, numbered.c.rn)).filter(in_page),
+                literal_column("'[]'::json")
+            ),
+            Text
+        ),
+        func.count(),
+        func.json_agg(
+            aggregate_order_by(func.json_build_array(numbered.c[column.key], numbered.c.id), numbered.c.rn.desc())
+        ).filter(in_page)
+    )).one()
+
+    has_next = fetched_count > page_size
+    next_cursor = None
+    if has_next:
+        value, last_id = last_key[0]
+        if column is Task.created_at:
+            # Mismo cursor que la ruta de filas (la fecha llega con el formato JSON de PostgreSQL)
+            value = datetime.fromisoformat(value)
+        next_cursor = _encode_cursor_key(sort, value, last_id)
+    seen = offset + min(fetched_count, page_size)
+    # count(*) OVER () no aporta nada aquí: window se resuelve como exact
+    total = _page_total(db, count_mode, filters, conditions, seen)
+    return splice_task_page(items_json.encode("utf-8"), {
+        "total": total,
+        "page": page if cursor is None else None,
+        "page_size": page_size,
+        "total_pages": _total_pages(total, page_size),
+        "has_next": has_next,
+        "next_cursor": next_cursor
+    })
+
+
+def iter_tasks(
+    db: Session,
+    filters: Optional[TaskFilter] = None,
+    sort: TaskSort = TaskSort.CREATED_AT_DESC,
+    batch_size: int = 1000
+):
+    """Recorrer todas las tareas del filtro en lotes, leyendo de un cursor de servidor.
+
+    yield_per activa stream_results: la memoria depende del lote, no del tamaño de la tabla.
+    """
+    statement = (
+        select(*Task.__table__.c)
+        .where(*filter_conditions(filters))
+        .order_by(*_order_keys(sort))
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in db.execute(statement).partitions():
+        yield batch
+
+
+# Columna generada fuera del modelo (ver TASK_SEARCH_DDL en models/task.py)
+_search_vector = literal_column("tasks.search_vector", type_=TSVECTOR)
+
+
+def search_tasks(db: Session, q: str, page: int = 1, page_size: int = 10) -> dict:
+    """Búsqueda por relevancia: texto completo en title+description y trigramas en title"""
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery("simple", q)
+        # ts_rank_cd pondera las coincidencias de texto; similarity tolera erratas en el título
+        rank = func.ts_rank_cd(_search_vector, tsquery) + func.similarity(Task.title, q)
+        matches = or_(_search_vector.bool_op("@@")(tsquery), Task.title.bool_op("%")(q))
+    else:
+        # Sin índices de búsqueda (p. ej. SQLite de pruebas): subcadena sin ranking
+        rank = literal(0.0)
+        matches = or_(
+            Task.title.icontains(q, autoescape=True),
+            Task.description.icontains(q, autoescape=True)
+        )
+
+    rows = db.execute(
+        select(*Task.__table__.c, rank.label("rank"))
+        .where(matches)
+        .order_by(rank.desc(), Task.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size + 1)
+    ).all()
+    return {
+        "items": rows[:page_size],
         "page": page,
         "page_size": page_size,
-        "total_pages": total_pages
+        "has_next": len(rows) > page_size
     }
 
 
-def update_task(db: Session, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        return None
-    
+class TaskVersionConflict(Exception):
+    """La tarea existe pero su versión no coincide con la de If-Match"""
+
+
+def _version_condition(db: Session, expected_version: datetime):
+    # Como en _cursor_condition: el valor con el tipo de la columna y, en SQLite, ambos
+    # lados normalizados (el texto guardado no se compara bien con el parámetro)
+    column = func.coalesce(Task.updated_at, Task.created_at)
+    bound = literal(expected_version, Task.updated_at.type)
+    if db.get_bind().dialect.name == "sqlite":
+        column, bound = _sqlite_timestamp(column), _sqlite_timestamp(bound)
+    return column == bound
+
+
+def _task_exists(db: Session, task_id: int) -> bool:
+    return db.query(Task.id).filter(Task.id == task_id).first() is not None
+
+
+def update_task(
+    db: Session,
+    task_id: int,
+    task_update: TaskUpdate,
+    expected_version: Optional[datetime] = None
+):
+    """UPDATE ... RETURNING en un solo viaje; None si la tarea no existe.
+
+    Con expected_version (If-Match) la versión forma parte del WHERE; solo si no se
+    actualiza ninguna fila se consulta si la tarea existe para distinguir 404 de 412.
+    """
     update_data = task_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_task, field, value)
-    
+    table = Task.__table__
+
+    if not update_data:
+        # Nada que cambiar: la tarea tal cual
+        row = db.execute(select(*table.c).where(Task.id == task_id)).first()
+        if row is not None and expected_version is not None and not same_version(row, expected_version):
+            raise TaskVersionConflict()
+        return row
+
+    conditions = [Task.id == task_id]
+    if expected_version is not None:
+        conditions.append(_version_condition(db, expected_version))
+    row = db.execute(
+        update(table).where(*conditions).values(**update_data).returning(*table.c)
+    ).first()
     db.commit()
-    db.refresh(db_task)
-    return db_task
+    if row is None:
+        if expected_version is not None and _task_exists(db, task_id):
+            raise TaskVersionConflict()
+        return None
+    invalidate_tasks([task_id])
+    return row
 
 
-def delete_task(db: Session, task_id: int) -> bool:
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        return False
-    
-    db.delete(db_task)
+def delete_task(db: Session, task_id: int, expected_version: Optional[datetime] = None) -> bool:
+    """DELETE ... RETURNING id en un solo viaje; False si la tarea no existe"""
+    conditions = [Task.id == task_id]
+    if expected_version is not None:
+        conditions.append(_version_condition(db, expected_version))
+    deleted = db.execute(delete(Task.__table__).where(*conditions).returning(Task.id)).first()
     db.commit()
-    return True
\ No newline at end of file
+    if deleted is None:
+        if expected_version is not None and _task_exists(db, task_id):
+            raise TaskVersionConflict()
+        return False
+    invalidate_tasks([task_id])
+    return True
+
+
+def _run_in_chunks(
+    db: Session,
+    build_statement,
+    ids: Optional[List[int]] = None,
+    filters: Optional[TaskFilter] = None,
+    return_ids: bool = False
+) -> dict:
+    """Aplicar build_statement(condición) por bloques de TASK_BULK_CHUNK_SIZE filas.
+
+    Cada bloque es una sola sentencia con RETURNING id y su propia transacción,
+    así un filtro enorme no mantiene bloqueos en una transacción gigante.
+    """
+    chunk_size = settings.TASK_BULK_CHUNK_SIZE
+    affected = 0
+    affected_ids = []
+
+    def run(condition) -> list:
+        nonlocal affected
+        chunk_ids = db.execute(build_statement(condition).returning(Task.id)).scalars().all()
+        db.commit()
+        if chunk_ids:
+            invalidate_tasks(chunk_ids)
+        affected += len(chunk_ids)
+        if return_ids:
+            affected_ids.extend(chunk_ids)
+        return chunk_ids
+
+    if ids is not None:
+        unique_ids = sorted(set(ids))
+        for start in range(0, len(unique_ids), chunk_size):
+            run(Task.id.in_(unique_ids[start:start + chunk_size]))
+    else:
+        # Recorrido por id: cada bloque avanza aunque la sentencia saque filas del filtro
+        conditions = filter_conditions(filters)
+        last_id = 0
+        while True:
+            chunk = (
+                select(Task.id)
+                .where(*conditions, Task.id > last_id)
+                .order_by(Task.id)
+                .limit(chunk_size)
+            )
+            chunk_ids = run(Task.id.in_(chunk.scalar_subquery()))
+            if len(chunk_ids) < chunk_size:
+                break
+            last_id = max(chunk_ids)
+
+    return {"affected": affected, "ids": affected_ids if return_ids else None}
+
+
+def update_tasks_bulk(
+    db: Session,
+    changes: TaskBulkChanges,
+    ids: Optional[List[int]] = None,
+    filters: Optional[TaskFilter] = None,
+    return_ids: bool = False
+) -> dict:
+    values = changes.model_dump(exclude_unset=True)
+    table = Task.__table__
+    return _run_in_chunks(
+        db,
+        lambda condition: update(table).where(condition).values(**values),
+        ids=ids, filters=filters, return_ids=return_ids
+    )
+
+
+def delete_tasks_bulk(
+    db: Session,
+    ids: Optional[List[int]] = None,
+    filters: Optional[TaskFilter] = None,
+    return_ids: bool = False
+) -> dict:
+    table = Task.__table__
+    return _run_in_chunks(
+        db,
+        lambda condition: delete(table).where(condition),
+        ids=ids, filters=filters, return_ids=return_ids
+    )
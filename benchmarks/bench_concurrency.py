@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concurrencia: GET /tasks/ en modo síncrono (threadpool) y asíncrono (AsyncEngine)
+Ejecutar con: python benchmarks/bench_concurrency.py --levels 10,50,100,200 --requests 2000
+
+Cada modo corre en un subproceso propio porque DB_ASYNC se lee al importar la aplicación.
+Requiere la base de datos configurada en .env y el usuario inicial creado.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+
+async def run_level(client, headers, concurrency, total_requests):
+    """Lanzar total_requests peticiones con como mucho `concurrency` en vuelo"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get("/tasks/", headers=headers, params={"count": "none"})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(total_requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+async def worker(levels, total_requests):
+    """Medir todos los niveles de concurrencia en el modo del proceso actual"""
+    import httpx
+    from app.core.config import settings
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/auth/login", json={
+            "email": settings.INITIAL_USER_EMAIL,
+            "password": settings.INITIAL_USER_PASSWORD,
+        })
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        # Calentamiento: abrir conexiones del pool y compilar consultas
+        await run_level(client, headers, max(levels), max(levels))
+        return [await run_level(client, headers, level, total_requests) for level in levels]
+
+
+def run_mode(mode, args):
+    env = dict(os.environ, DB_ASYNC="true" if mode == "async" else "false")
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", "--levels", args.levels, "--requests", str(args.requests)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", default="10,50,100,200", help="Niveles de concurrencia separados por comas")
+    parser.add_argument("--requests", type=int, default=2000, help="Peticiones por nivel")
+    parser.add_argument("--modes", default="sync,async", help="Modos a medir")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    if args.worker:
+        print(json.dumps(asyncio.run(worker(levels, args.requests))))
+        return
+
+    print(f"{'modo':<6} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errores':>8}")
+    for mode in args.modes.split(","):
+        for row in run_mode(mode, args):
+            print(
+                f"{mode:<6} {row['concurrency']:>5} {row['rps']:>9} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark de verificación de tokens: jwt.decode frente a la ruta rápida HS256 y la caché
+Ejecutar con: python benchmarks/bench_jwt.py [--repeat 7]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.core import security
+from benchmarks.harness import measure
+
+
+def bench(label, fn, repeat):
+    """Mediana del tiempo por llamada (ver benchmarks/harness.py)"""
+    median = measure(fn, repeat=repeat)["median_us"]
+    print(f"  {label:<28} {median:8.2f} µs/op")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de decode_access_token")
+    parser.add_argument("--repeat", type=int, default=7, help="Muestras por caso")
+    args = parser.parse_args()
+
+    token = security.create_access_token({"sub": "bench@example.com", "uid": 1, "ver": 1})
+    assert security._decode_jose(token) == security._decode_hs256(token)
+
+    print("decode_access_token")
+    jose = bench("python-jose jwt.decode", lambda: security._decode_jose(token), args.repeat)
+    fast = bench("HS256 directo (hmac)", lambda: security._decode_hs256(token), args.repeat)
+    cached = bench("caché por digest", lambda: security.decode_access_token(token), args.repeat)
+    print(f"  ruta rápida: x{jose / fast:.1f}   caché: x{jose / cached:.1f} frente a jwt.decode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark de serialización de GET /tasks: ruta actual de FastAPI frente a FAST_JSON
+Ejecutar con: python benchmarks/bench_serialization.py [--items 100] [--number 500]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.core.serialization import TASK_FIELDS, dump_task_page, splice_task_page
+from app.models.task import TaskStatus
+from app.schemas.task import TaskListResponse
+
+
+def bench(label, fn, number, repeat=5):
+    """Mejor tiempo por llamada de `repeat` series de `number` llamadas"""
+    fn()
+    best = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+    print(f"  {label:<36} {best * 1e6:9.1f} µs/op")
+    return best
+
+
+def build_page(items: int) -> dict:
+    """Resultado de get_tasks con objetos tipo ORM (atributos, sin validar)"""
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    statuses = list(TaskStatus)
+    tasks = [
+        SimpleNamespace(
+            id=i,
+            title=f"Tarea {i}",
+            description="Descripción de prueba " * 3,
+            status=statuses[i % len(statuses)],
+            created_at=now - timedelta(minutes=i),
+            updated_at=now if i % 2 else None,
+        )
+        for i in range(1, items + 1)
+    ]
+    return {
+        "items": tasks,
+        "total": 10_000,
+        "page": 1,
+        "page_size": items,
+        "total_pages": 10_000 // items,
+        "has_next": True,
+        "next_cursor": "WyItY3JlYXRlZF9hdCIsIjIwMjQtMDEtMDEiLDFd",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--items", type=int, default=100, help="Tareas por página")
+    parser.add_argument("--number", type=int, default=500, help="Llamadas por serie")
+    args = parser.parse_args()
+
+    result = build_page(args.items)
+    # Lo que hace FastAPI con response_model: validar (from_attributes) y volcar a JSON
+    response_adapter = TypeAdapter(TaskListResponse)
+
+    def fastapi_path(response_class):
+        value = response_adapter.validate_python(result, from_attributes=True)
+        return response_class(response_adapter.dump_python(value, mode="json")).body
+
+    # json_agg: la base de datos entrega el array ya serializado; aquí se simula con bytes fijos
+    items_json = json.dumps(json.loads(dump_task_page(result))["items"]).encode("utf-8")
+    meta = {key: value for key, value in result.items() if key != "items"}
+
+    assert json.loads(fastapi_path(JSONResponse)) == json.loads(dump_task_page(result))
+    assert set(TASK_FIELDS) == set(json.loads(dump_task_page(result))["items"][0])
+
+    print(f"TaskListResponse con {args.items} tareas")
+    base = bench("response_model + JSONResponse", lambda: fastapi_path(JSONResponse), args.number)
+    orjson_path = bench("response_model + ORJSONResponse", lambda: fastapi_path(ORJSONResponse), args.number)
+    adapter = bench("TypeAdapter sin validar (rows)", lambda: dump_task_page(result), args.number)
+    spliced = bench("json_agg (solo metadatos)", lambda: splice_task_page(items_json, meta), args.number)
+    print(
+        f"  ORJSONResponse: x{base / orjson_path:.1f}   rows: x{base / adapter:.1f}   "
+        f"json_agg: x{base / spliced:.1f} frente a la ruta actual"
+    )
+
+
+if __name__ == "__main__":
+    main()
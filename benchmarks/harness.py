@@ -0,0 +1,102 @@
+"""
+Utilidades comunes de los microbenchmarks: medición estable, estadísticas e historial
+
+Cada caso se calienta, se calibra con timeit.autorange para que cada muestra dure al
+menos `min_time` y se mide `repeat` veces con el GC desactivado (timeit). Se informa del
+mínimo, la mediana, la media, la desviación y el rango intercuartílico por operación.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def measure(fn, repeat: int = 7, min_time: float = 0.2, warmup: float = 0.1) -> dict:
+    """Estadísticas en µs por llamada de fn()"""
+    deadline = time.perf_counter() + warmup
+    fn()
+    while time.perf_counter() < deadline:
+        fn()
+
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+
+    samples = [total / number * 1e6 for total in timer.repeat(repeat=repeat, number=number)]
+    quartiles = statistics.quantiles(samples, n=4) if len(samples) > 1 else [samples[0]] * 3
+    median = statistics.median(samples)
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "min_us": round(min(samples), 3),
+        "median_us": round(median, 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+        "iqr_us": round(quartiles[2] - quartiles[0], 3),
+        "ops_per_sec": round(1e6 / median, 1) if median else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def load_history(path: Path, suite: str) -> list:
+    """Entradas anteriores de una suite, de la más antigua a la más reciente"""
+    if not path.exists():
+        return []
+    entries = []
+    with path.open(encoding="utf-8") as history:
+        for line in history:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get("suite") == suite:
+                    entries.append(entry)
+    return entries
+
+
+def append_history(path: Path, suite: str, results: dict, extra: dict = None) -> dict:
+    """Añadir una ejecución (una línea JSON) al historial"""
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "suite": suite,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        **(extra or {}),
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as history:
+        history.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def print_header():
+    print(f"  {'caso':<40} {'mediana µs':>12} {'min µs':>10} {'±iqr':>9} {'ops/s':>12} {'vs ant.':>8}")
+
+
+def print_result(name: str, stats: dict, previous: dict = None):
+    change = ""
+    if previous and previous.get("median_us"):
+        change = f"{(stats['median_us'] - previous['median_us']) / previous['median_us']:+.1%}"
+    print(
+        f"  {name:<40} {stats['median_us']:>12.2f} {stats['min_us']:>10.2f} "
+        f"{stats['iqr_us']:>9.2f} {stats['ops_per_sec']:>12,.0f} {change:>8}"
+    )
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de extremo a extremo con una mezcla configurable de operaciones
+Ejecutar con: python benchmarks/loadtest.py --sqlite --duration 20 --concurrency 50
+              python benchmarks/loadtest.py --target uvicorn --baseline benchmarks/results/baseline.json
+
+Mide la aplicación real en proceso (httpx + ASGI) o servida por uvicorn, contra la base
+de datos del .env (PostgreSQL) o contra un SQLite local (--sqlite) creado para la prueba.
+Guarda req/s y p50/p95/p99 por ruta en JSON y, con --baseline, falla (código 1) si alguna
+ruta empeora más que --threshold respecto a la referencia.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+RESULTS_DIR = root_dir / "benchmarks" / "results"
+DEFAULT_MIX = "login=1,create=2,list=6,read=6,update=3,delete=1"
+OPERATIONS = ("login", "create", "list", "read", "update", "delete")
+# Métricas comparadas con la referencia: (clave, True si más alto es mejor)
+COMPARED = (("rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False))
+
+
+def parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"operación desconocida: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Latencias y códigos de estado por ruta"""
+
+    def __init__(self):
+        self.latencies: dict[str, list] = {}
+        self.errors: dict[str, int] = {}
+        self.statuses: dict[str, dict] = {}
+
+    def add(self, route: str, seconds: float, status_code: int, ok: bool):
+        self.latencies.setdefault(route, []).append(seconds)
+        statuses = self.statuses.setdefault(route, {})
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            routes[route] = self._stats(values, elapsed, self.errors.get(route, 0))
+            routes[route]["status_codes"] = self.statuses[route]
+        every = [value for values in self.latencies.values() for value in values]
+        return {"routes": routes, "total": self._stats(every, elapsed, sum(self.errors.values()))}
+
+    @staticmethod
+    def _stats(values: list, elapsed: float, errors: int) -> dict:
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "errors": errors,
+            "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+            "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        }
+
+
+class Scenario:
+    """Operaciones de la mezcla sobre un conjunto compartido de tareas propias"""
+
+    def __init__(self, client, credentials: dict, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.credentials = credentials
+        self.recorder = recorder
+        self.rng = rng
+        self.headers = {}
+        self.task_ids: list[int] = []
+
+    async def call(self, route: str, method: str, url: str, expected: int, **kwargs):
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.recorder.add(route, elapsed, response.status_code, response.status_code == expected)
+        return response
+
+    async def login(self):
+        response = await self.call("POST /auth/login", "POST", "/auth/login", 200, json=self.credentials)
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def create(self):
+        response = await self.call("POST /tasks/", "POST", "/tasks/", 201, json={
+            "title": f"Carga {self.rng.randrange(1_000_000)}",
+            "description": "Tarea generada por benchmarks/loadtest.py",
+        })
+        if response.status_code == 201:
+            self.task_ids.append(response.json()["id"])
+
+    async def list(self):
+        await self.call("GET /tasks/", "GET", "/tasks/", 200, params={"page_size": 20})
+
+    async def read(self):
+        if not self.task_ids:
+            return await self.create()
+        task_id = self.rng.choice(self.task_ids)
+        await self.call("GET /tasks/{id}", "GET", f"/tasks/{task_id}", 200)
+
+    async def update(self):
+        if not self.task_ids:
+            return await self.create()
+        task_id = self.rng.choice(self.task_ids)
+        await self.call("PUT /tasks/{id}", "PUT", f"/tasks/{task_id}", 200, json={
+            "status": self.rng.choice(["pending", "in_progress", "done"]),
+        })
+
+    async def delete(self):
+        # Siempre queda alguna tarea para lecturas y actualizaciones
+        if len(self.task_ids) < 2:
+            return await self.create()
+        task_id = self.task_ids.pop(self.rng.randrange(len(self.task_ids)))
+        await self.call("DELETE /tasks/{id}", "DELETE", f"/tasks/{task_id}", 204)
+
+
+async def run_load(client, args, mix: dict) -> dict:
+    from app.core.config import settings
+
+    rng = random.Random(args.seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    credentials = {"email": settings.INITIAL_USER_EMAIL, "password": settings.INITIAL_USER_PASSWORD}
+
+    # Calentamiento (no se registra): token, conexiones del pool y tareas de partida
+    scenario = Scenario(client, credentials, Recorder(), rng)
+    response = await scenario.login()
+    if response.status_code != 200:
+        raise SystemExit(f"Login fallido ({response.status_code}): {response.text}")
+    for _ in range(max(args.concurrency, 20)):
+        await scenario.create()
+    await asyncio.gather(*(scenario.list() for _ in range(args.concurrency)))
+
+    recorder = Recorder()
+    scenario.recorder = recorder
+    deadline = time.perf_counter() + args.duration
+    remaining = args.requests
+
+    async def worker():
+        nonlocal remaining
+        while time.perf_counter() < deadline:
+            if args.requests:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            operation = rng.choices(names, weights)[0]
+            await getattr(scenario, operation)()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return recorder.summary(time.perf_counter() - start)
+
+
+async def run_asgi(args, mix: dict) -> dict:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as client:
+        return await run_load(client, args, mix)
+
+
+async def run_uvicorn(args, mix: dict) -> dict:
+    import httpx
+
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(args.port),
+        "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+    ]
+    server = subprocess.Popen(command, cwd=root_dir, env=os.environ.copy())
+    base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+            for _ in range(100):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise SystemExit("uvicorn terminó antes de arrancar")
+                await asyncio.sleep(0.1)
+            else:
+                raise SystemExit("uvicorn no respondió en 10 s")
+            return await run_load(client, args, mix)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def prepare_sqlite(path: Path):
+    """Crear el esquema y el usuario inicial en un SQLite nuevo"""
+    from app.db.database import engine
+    from app.db.startup import run_startup
+
+    run_startup()
+    engine.dispose()
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Rutas y métricas que empeoran más de `threshold` (fracción) respecto a la referencia"""
+    regressions = []
+    for route, base in baseline["routes"].items():
+        now = current["routes"].get(route)
+        if now is None:
+            continue
+        for key, higher_is_better in COMPARED:
+            if not base.get(key):
+                continue
+            change = (now[key] - base[key]) / base[key]
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append((route, key, base[key], now[key], change))
+    return regressions
+
+
+def print_table(result: dict):
+    print(f"{'ruta':<22} {'req':>7} {'err':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(result["routes"].items()) + [("TOTAL", result["total"])]
+    for route, row in rows:
+        print(
+            f"{route:<22} {row['requests']:>7} {row['errors']:>5} {row['rps']:>9} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+        )
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi", help="App en proceso o servida por uvicorn")
+    parser.add_argument("--sqlite", nargs="?", const=str(RESULTS_DIR / "loadtest.db"), metavar="RUTA",
+                        help="Usar un SQLite local nuevo en lugar de la base de datos del .env")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Pesos por operación (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=50, help="Clientes concurrentes")
+    parser.add_argument("--duration", type=float, default=20.0, help="Segundos de medición")
+    parser.add_argument("--requests", type=int, default=0, help="Tope de peticiones (0 = solo duración)")
+    parser.add_argument("--seed", type=int, default=1234, help="Semilla de la mezcla")
+    parser.add_argument("--port", type=int, default=8765, help="Puerto de uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "loadtest.json", help="Fichero JSON de resultados")
+    parser.add_argument("--baseline", type=Path, help="Resultados de referencia con los que comparar")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar también estos resultados como referencia")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Empeoramiento tolerado (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    # La configuración de la base de datos se lee al importar la aplicación
+    if args.sqlite:
+        sqlite_path = Path(args.sqlite).resolve()
+        sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        sqlite_path.unlink(missing_ok=True)
+        os.environ["DB_URL"] = f"sqlite:///{sqlite_path}"
+        os.environ["DB_ASYNC"] = "false"
+        prepare_sqlite(sqlite_path)
+
+    from app.core.config import settings
+
+    runner = run_uvicorn if args.target == "uvicorn" else run_asgi
+    result = asyncio.run(runner(args, args.mix))
+    result["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.target,
+        "database": settings.DATABASE_URL.split(":", 1)[0],
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": args.mix,
+        "workers": args.workers if args.target == "uvicorn" else None,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+    }
+
+    print_table(result)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nResultados en {args.output}")
+
+    baseline_path = args.baseline or RESULTS_DIR / "loadtest-baseline.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Referencia guardada en {baseline_path}")
+        return True
+
+    if args.baseline is None:
+        return True
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(result, baseline, args.threshold)
+    if not regressions:
+        print(f"Sin regresiones de más del {args.threshold:.0%} frente a {args.baseline}")
+        return True
+    print(f"\nRegresiones de más del {args.threshold:.0%} frente a {args.baseline}:")
+    for route, key, before, after, change in regressions:
+        print(f"  {route:<22} {key:<7} {before:>10} -> {after:<10} ({change:+.1%})")
+    return False
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks de las funciones que corren en cada petición
+Ejecutar con: python benchmarks/microbench.py [--filter task_service] [--repeat 7] [--no-history]
+
+Cubre security (tokens y bcrypt), task_service sobre SQLite en memoria y las
+conversiones Pydantic de schemas/task.py. Cada ejecución se añade a
+benchmarks/results/microbench-history.jsonl y se compara con la anterior.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root_dir))
+
+# Se mide el coste real de cada función: sin caché de tareas
+os.environ["TASK_CACHE_BACKEND"] = "none"
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.harness import RESULTS_DIR, append_history, load_history, measure, print_header, print_result
+from app.core import security
+from app.core.config import settings
+from app.core.serialization import dump_task_page
+from app.db.database import Base
+from app.models.task import Task, TaskStatus
+from app.schemas.task import CountMode, Task as TaskSchema, TaskCreate, TaskListResponse, TaskSort, TaskUpdate
+from app.services import task_service
+
+HISTORY = RESULTS_DIR / "microbench-history.jsonl"
+SUITE = "microbench"
+
+
+def security_cases() -> dict:
+    claims = {"sub": "bench@example.com", "uid": 1, "ver": settings.AUTH_TOKEN_VERSION}
+    token = security.create_access_token(claims)
+    hashed = security.get_password_hash("bench-password")
+    return {
+        "security.create_access_token": lambda: security.create_access_token(claims),
+        "security.decode_access_token (jose)": lambda: security._decode_jose(token),
+        "security.decode_access_token (hs256)": lambda: security._decode_hs256(token),
+        "security.decode_access_token (caché)": lambda: security.decode_access_token(token),
+        f"security.verify_password ({settings.BCRYPT_ROUNDS} rounds)":
+            lambda: security.verify_password("bench-password", hashed),
+    }
+
+
+def task_service_cases() -> dict:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    task_service.create_tasks_bulk(db, [
+        TaskCreate(title=f"Tarea {i}", description="Microbenchmark", status=list(TaskStatus)[i % 3])
+        for i in range(1000)
+    ])
+    task_id = task_service.create_task(db, TaskCreate(title="Objetivo")).id
+    page = task_service.get_tasks(db, page_size=100, count_mode=CountMode.NONE)
+    cursor = page["next_cursor"]
+    # Medir el modo cursor solo si de verdad avanza: una página 2 igual a la 1 mediría otra consulta
+    first_ids = {task.id for task in page["items"]}
+    next_ids = {task.id for task in task_service.get_tasks(db, page_size=100, cursor=cursor)["items"]}
+    if not next_ids or next_ids & first_ids:
+        raise RuntimeError("El cursor de get_tasks no avanza de la página 1: el caso cursor no es válido")
+    change = TaskUpdate(status=TaskStatus.DONE)
+
+    def read_one():
+        # Sesión limpia como en cada petición: sin objetos ya cargados en el identity map
+        db.expunge_all()
+        return task_service.get_task(db, task_id)
+
+    def create_and_delete():
+        task_service.delete_task(db, task_service.create_task(db, TaskCreate(title="Temporal")).id)
+
+    return {
+        "task_service.get_task": read_one,
+        "task_service.get_tasks (100, count=none)":
+            lambda: task_service.get_tasks(db, page_size=100, count_mode=CountMode.NONE),
+        "task_service.get_tasks (100, count=exact)":
+            lambda: task_service.get_tasks(db, page_size=100, count_mode=CountMode.EXACT),
+        "task_service.get_tasks (100, filas Core)":
+            lambda: task_service.get_tasks(db, page_size=100, count_mode=CountMode.NONE, as_rows=True),
+        "task_service.get_tasks (100, cursor)":
+            lambda: task_service.get_tasks(db, page_size=100, cursor=cursor),
+        "task_service.update_task": lambda: task_service.update_task(db, task_id, change),
+        "task_service.create_task + delete_task": create_and_delete,
+        "task_service.encode_cursor": lambda: task_service.encode_cursor(TaskSort.CREATED_AT_DESC, page["items"][0]),
+        "task_service.decode_cursor": lambda: task_service.decode_cursor(cursor, TaskSort.CREATED_AT_DESC),
+    }
+
+
+def schema_cases() -> dict:
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tasks = [
+        Task(id=i, title=f"Tarea {i}", description="Microbenchmark", status=TaskStatus.PENDING,
+             created_at=now - timedelta(minutes=i), updated_at=now)
+        for i in range(1, 101)
+    ]
+    result = {
+        "items": tasks, "total": 1000, "page": 1, "page_size": 100,
+        "total_pages": 10, "has_next": True, "next_cursor": None,
+    }
+    payload = {"title": "Nueva tarea", "description": "Descripción", "status": "pending"}
+    validated = TaskListResponse.model_validate(result, from_attributes=True)
+    return {
+        "schemas.TaskCreate.model_validate": lambda: TaskCreate.model_validate(payload),
+        "schemas.Task.model_validate (ORM)": lambda: TaskSchema.model_validate(tasks[0]),
+        "schemas.TaskListResponse validate (100)":
+            lambda: TaskListResponse.model_validate(result, from_attributes=True),
+        "schemas.TaskListResponse dump_json (100)": validated.model_dump_json,
+        "serialization.dump_task_page (100)": lambda: dump_task_page(result),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Ejecutar solo los casos que contienen este texto")
+    parser.add_argument("--repeat", type=int, default=7, help="Muestras por caso")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Segundos mínimos por muestra")
+    parser.add_argument("--no-history", action="store_true", help="No guardar la ejecución en el historial")
+    args = parser.parse_args()
+
+    history = load_history(HISTORY, SUITE)
+    previous = history[-1]["results"] if history else {}
+    results = {}
+    for group in (security_cases, task_service_cases, schema_cases):
+        cases = {name: fn for name, fn in group().items() if args.filter in name}
+        if not cases:
+            continue
+        print(group.__name__.replace("_cases", ""))
+        print_header()
+        for name, fn in cases.items():
+            results[name] = measure(fn, repeat=args.repeat, min_time=args.min_time)
+            print_result(name, results[name], previous.get(name))
+
+    if results and not args.no_history:
+        entry = append_history(HISTORY, SUITE, results, {"bcrypt_rounds": settings.BCRYPT_ROUNDS})
+        print(f"\nEjecución {entry['commit'] or '-'} añadida a {HISTORY}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Calibrar el coste de bcrypt para una latencia objetivo de verificación en esta máquina
+Ejecutar con: python calibrate_bcrypt.py [--target-ms 250] [--write-env]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent
+sys.path.insert(0, str(root_dir))
+
+from app.core.config import settings, ENV_PATH
+from app.core.security import calibrate_bcrypt_rounds
+
+
+def write_env(rounds):
+    """Guardar BCRYPT_ROUNDS en el .env, reemplazando el valor anterior si existe"""
+    lines = ENV_PATH.read_text(encoding="utf-8").splitlines() if ENV_PATH.exists() else []
+    lines = [line for line in lines if not line.startswith("BCRYPT_ROUNDS=")]
+    lines.append(f"BCRYPT_ROUNDS={rounds}")
+    ENV_PATH.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrar BCRYPT_ROUNDS")
+    parser.add_argument("--target-ms", type=float, default=settings.BCRYPT_TARGET_MS,
+                        help="Latencia objetivo de una verificación en ms")
+    parser.add_argument("--write-env", action="store_true", help="Guardar el resultado en .env")
+    args = parser.parse_args()
+
+    rounds, timings = calibrate_bcrypt_rounds(args.target_ms)
+    for cost, ms in timings.items():
+        print(f"  rounds={cost:<3} {ms:8.1f} ms")
+    print(f"BCRYPT_ROUNDS={rounds} (objetivo {args.target_ms:.0f} ms, actual {settings.BCRYPT_ROUNDS})")
+
+    if args.write_env:
+        write_env(rounds)
+        print(f"Guardado en {ENV_PATH}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
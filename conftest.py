@@ -0,0 +1,94 @@
+"""
+Configuración común de las pruebas (pytest): la API sobre SQLite en memoria, sin caché de
+tareas ni sesiones asíncronas, y con el usuario autenticado sustituido.
+
+Las pruebas que necesitan PostgreSQL usan el fixture postgres_engine y se omiten si no se
+define TEST_POSTGRES_URL (p. ej. postgresql+psycopg://postgres:@/pruebas?host=/tmp/pgdata).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent
+sys.path.insert(0, str(root_dir))
+
+# Antes de importar la aplicación: se cuentan los viajes reales a la BD y nada apunta a PostgreSQL
+os.environ["TASK_CACHE_BACKEND"] = "none"
+os.environ["DB_ASYNC"] = "false"
+os.environ["DB_URL"] = "sqlite://"
+os.environ["DB_STARTUP_CHECK"] = "false"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base, SessionLocal, get_session
+from app.main import app
+from app.models.task import Task
+from app.schemas.user import CurrentUser
+from app.services.auth_service import get_current_user
+
+# Script manual contra un servidor en marcha (python test_api.py), no es de pytest
+collect_ignore = ["test_api.py"]
+
+test_engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(bind=test_engine, autoflush=False)
+Base.metadata.create_all(test_engine)
+
+
+def _override_session():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_session] = _override_session
+# Exportación e importación abren su propia sesión (fuera de la dependencia)
+SessionLocal.configure(bind=test_engine)
+app.dependency_overrides[get_current_user] = lambda: CurrentUser(id=1, email="test@example.com")
+
+
+@pytest.fixture(autouse=True)
+def _empty_tasks():
+    """Cada prueba empieza sin tareas"""
+    with test_engine.begin() as conn:
+        conn.execute(delete(Task.__table__))
+
+
+@pytest.fixture
+def engine():
+    return test_engine
+
+
+@pytest.fixture
+def postgres_engine():
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL no definida")
+    pg = create_engine(url)
+    Base.metadata.create_all(pg)
+    yield pg
+    pg.dispose()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
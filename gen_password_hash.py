@@ -3,10 +3,8 @@
 Script para generar hash de contraseña usando bcrypt directamente
 """
 
-import bcrypt
+from app.core.security import get_password_hash
 
 password = "admin123"
-# Generar salt y hash
-salt = bcrypt.gensalt(rounds=12)
-hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-print(hashed.decode('utf-8'))
+# Generar salt y hash (coste BCRYPT_ROUNDS)
+print(get_password_hash(password))
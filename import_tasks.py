@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script para importar tareas desde un fichero CSV o NDJSON (COPY en PostgreSQL)
+Ejecutar con: python import_tasks.py tareas.csv [--format csv]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent
+sys.path.insert(0, str(root_dir))
+
+from app.db.database import SessionLocal
+from app.schemas.task import TaskFileFormat
+from app.services.import_service import import_tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importar tareas")
+    parser.add_argument("path", help="Fichero CSV (cabecera title,description,status) o NDJSON")
+    parser.add_argument("--format", choices=[f.value for f in TaskFileFormat],
+                        help="Formato; por defecto según la extensión")
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    file_format = args.format or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+
+    try:
+        with path.open("rb") as stream, SessionLocal() as db:
+            result = import_tasks(db, stream, TaskFileFormat(file_format))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+    print(f"Inserted: {result['inserted']}  Rejected: {result['rejected']}")
+    print(f"Time: {result['seconds']}s  ({result['rows_per_second']} rows/s)")
+    for error in result["errors"]:
+        print(f"  line {error.line}: {error.errors[0].get('msg')}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
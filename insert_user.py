@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 """
 Insertar usuario inicial directamente en la base de datos
-Usa bcrypt directamente para evitar problemas de compatibilidad
+Usa bcrypt directamente (vía get_password_hash) para evitar problemas de compatibilidad
 """
 
 import sys
 from pathlib import Path
-import bcrypt
 
 # Agregar el directorio raíz al path
 root_dir = Path(__file__).parent
 sys.path.insert(0, str(root_dir))
 
+from app.core.security import get_password_hash
 from app.db.database import SessionLocal
 from app.models.user import User
 from sqlalchemy import text
@@ -22,9 +22,8 @@ def insert_user_direct():
     password = "admin123"
     email = "admin@example.com"
     
-    # Generar hash con bcrypt
-    salt = bcrypt.gensalt(rounds=12)
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    # Generar hash con bcrypt (coste BCRYPT_ROUNDS)
+    hashed_password = get_password_hash(password)
     
     try:
         db = SessionLocal()
@@ -40,9 +40,12 @@ CREATE TABLE IF NOT EXISTS tasks (
 );
 
 CREATE INDEX IF NOT EXISTS ix_tasks_id ON tasks(id);
-CREATE INDEX IF NOT EXISTS ix_tasks_title ON tasks(title);
 CREATE INDEX IF NOT EXISTS ix_tasks_status ON tasks(status);
-CREATE INDEX IF NOT EXISTS ix_tasks_created_at ON tasks(created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_created_at_id ON tasks(created_at, id);
+CREATE INDEX IF NOT EXISTS ix_tasks_status_created_at_id ON tasks(status, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_tasks_title_id ON tasks(title, id);
+CREATE INDEX IF NOT EXISTS ix_tasks_title_pattern ON tasks(title varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS ix_tasks_updated_at ON tasks(updated_at);
 
 -- Mostrar información
 \dt
@@ -0,0 +1,73 @@
+"""
+Pruebas de la sonda de readiness (DatabaseProbe) y de /health
+Ejecutar con: python -m pytest test_health.py
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+from app.services import health_service
+from app.services.health_service import DatabaseProbe, database_probe
+
+
+def pools(checked_out: int) -> dict:
+    return {"sync": {"size": settings.DB_POOL_SIZE, "checked_out": checked_out, "overflow": 0}}
+
+
+@pytest.fixture
+def probe(engine, monkeypatch):
+    monkeypatch.setattr(health_service, "pool_status", lambda: pools(0))
+    probe = DatabaseProbe(interval=5, timeout=2)
+    probe._engine = engine
+    return probe
+
+
+def test_probe_is_not_ready_until_the_first_check(probe):
+    assert probe.snapshot() == {"status": "starting", "ready": False}
+
+
+def test_probe_is_ready_with_database_and_free_pool(probe):
+    result = asyncio.run(probe.check())
+    assert result["ready"] is True and result["status"] == "ready"
+    assert result["database"] == "ok" and result["rtt_ms"] >= 0
+    assert probe.snapshot()["ready"] is True
+
+
+def test_probe_reports_database_errors(probe, tmp_path):
+    probe._engine = create_engine(f"sqlite:///{tmp_path / 'no-existe' / 'db.sqlite'}")
+    result = asyncio.run(probe.check())
+    assert result["ready"] is False
+    assert result["problems"] == ["database"]
+    assert result["error"].startswith("OperationalError")
+
+
+def test_probe_reports_pool_saturation(probe, monkeypatch):
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    monkeypatch.setattr(health_service, "pool_status", lambda: pools(capacity))
+    result = asyncio.run(probe.check())
+    assert result["problems"] == ["pool_saturation"]
+    assert result["pool_saturation"] == 1.0
+
+
+def test_stale_probe_is_not_ready(probe):
+    asyncio.run(probe.check())
+    probe.checked_at = time.monotonic() - (3 * probe.interval + probe.timeout + 1)
+    snapshot = probe.snapshot()
+    assert snapshot["ready"] is False and snapshot["problems"] == ["stale_probe"]
+
+
+def test_health_endpoints_follow_the_probe(client, monkeypatch):
+    assert client.get("/health/live").json() == {"status": "alive"}
+    monkeypatch.setattr(database_probe, "result", {"status": "starting", "ready": False})
+    monkeypatch.setattr(database_probe, "checked_at", None)
+    assert client.get("/health/ready").status_code == 503
+    assert client.get("/health").status_code == 503
+
+    monkeypatch.setattr(database_probe, "result", {"status": "ready", "ready": True})
+    monkeypatch.setattr(database_probe, "checked_at", time.monotonic())
+    assert client.get("/health/ready").status_code == 200
+    assert client.get("/health").json()["status"] == "ready"
@@ -0,0 +1,81 @@
+"""
+Prueba de la validación de filas de POST /tasks/import y de la carga (SQLite; COPY con PostgreSQL)
+Ejecutar con: python -m pytest test_import.py
+"""
+
+import io
+import json
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.task import Task
+from app.schemas.task import TaskFileFormat
+from app.services.import_service import _iter_valid_tasks, import_tasks
+
+
+def validate(lines: list) -> tuple:
+    """Líneas aceptadas y report de rechazos de un NDJSON"""
+    stream = io.BytesIO("".join(json.dumps(line) + "\n" for line in lines).encode("utf-8"))
+    report = {"rejected": 0, "errors": []}
+    accepted = [line for line, _ in _iter_valid_tasks(stream, TaskFileFormat.NDJSON, 64, report)]
+    return accepted, report
+
+
+def test_nul_character_is_rejected_per_row():
+    accepted, report = validate([
+        {"title": "Buena"},
+        {"title": "Con \u0000 NUL"},
+        {"title": "Otra", "description": "fin\u0000"},
+        {"title": "Última"},
+    ])
+    assert accepted == [1, 4]
+    assert report["rejected"] == 2
+    assert [error.line for error in report["errors"]] == [2, 3]
+    assert report["errors"][0].errors[0]["type"] == "nul_character"
+
+
+def test_invalid_rows_do_not_stop_the_stream():
+    accepted, report = validate([{"title": ""}, {"title": "Bien", "status": "done"}])
+    assert accepted == [2]
+    assert report["rejected"] == 1
+
+
+
+CSV_WITH_REJECTS = (
+    "title,description,status\n"
+    "Uno,primera,pending\n"
+    "Dos,,done\n"
+    f"{'x' * 201},demasiado largo,pending\n"
+    "Tres,estado malo,bogus\n"
+    "Cuatro,,in_progress\n"
+)
+
+
+def _import_and_read(engine):
+    with Session(engine) as session:
+        before = session.scalar(select(func.max(Task.id))) or 0
+        result = import_tasks(session, io.BytesIO(CSV_WITH_REJECTS.encode("utf-8")), TaskFileFormat.CSV)
+        rows = session.execute(
+            select(Task.title, Task.description, Task.status).where(Task.id > before).order_by(Task.id)
+        ).all()
+    return result, [(title, description, status.value) for title, description, status in rows]
+
+
+def check_import(engine):
+    result, rows = _import_and_read(engine)
+    assert (result["inserted"], result["rejected"]) == (3, 2)
+    assert [(error.line, error.errors[0]["loc"][0]) for error in result["errors"]] == [
+        (4, "title"), (5, "status"),
+    ]
+    assert rows == [
+        ("Uno", "primera", "pending"), ("Dos", None, "done"), ("Cuatro", None, "in_progress"),
+    ]
+
+
+def test_import_inserts_valid_rows_in_order_and_reports_rejects(engine):
+    check_import(engine)
+
+
+def test_copy_import_into_postgres(postgres_engine):
+    check_import(postgres_engine)
@@ -0,0 +1,49 @@
+"""
+Pruebas de /monitoring y del estado del pool
+Ejecutar con: python -m pytest test_monitoring.py
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.db.pool import InstrumentedQueuePool, pool_snapshot
+from app.main import app
+from app.services.auth_service import get_current_user
+
+
+@pytest.fixture
+def anonymous_client(client):
+    override = app.dependency_overrides.pop(get_current_user)
+    yield client
+    app.dependency_overrides[get_current_user] = override
+
+
+@pytest.mark.parametrize("path", ["/monitoring/pool", "/monitoring/cache", "/monitoring/startup", "/monitoring/profiles"])
+def test_monitoring_requires_authentication(anonymous_client, path):
+    # HTTPBearer responde 403 sin cabecera; un token inválido, 401
+    assert anonymous_client.get(path).status_code == 403
+    assert anonymous_client.get(path, headers={"Authorization": "Bearer no-valido"}).status_code == 401
+
+
+def test_monitoring_with_authentication(client):
+    assert set(client.get("/monitoring/cache").json()) == {"users", "tokens", "tasks"}
+    assert client.get("/monitoring/startup").status_code == 200
+
+
+def test_pool_snapshot_overflow_is_never_negative(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=2
+    )
+    try:
+        first = engine.connect()
+        snapshot = pool_snapshot(engine.pool)
+        assert (snapshot["checked_out"], snapshot["overflow"]) == (1, 0)
+
+        more = [engine.connect() for _ in range(2)]
+        snapshot = pool_snapshot(engine.pool)
+        assert (snapshot["checked_out"], snapshot["overflow"]) == (3, 1)
+        for conn in [first, *more]:
+            conn.close()
+        assert pool_snapshot(engine.pool)["checked_out"] == 0
+    finally:
+        engine.dispose()
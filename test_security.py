@@ -0,0 +1,116 @@
+"""
+Pruebas de app.core.security: la ruta rápida HS256 (_decode_hs256) frente a python-jose y el
+descarte de inicios de sesión con el pool de bcrypt lleno
+Ejecutar con: python -m pytest test_security.py
+"""
+
+import asyncio
+import base64
+import json
+import threading
+import time
+
+import pytest
+from jose import jwt
+
+from app.core import security
+from app.core.config import settings
+from app.core.security import _decode_hs256, _decode_jose
+from app.models.user import User
+
+
+def _segment(data: dict) -> str:
+    raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _sign(claims: dict) -> str:
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm="HS256")
+
+
+def _tampered(claims: dict) -> str:
+    header, _, signature = _sign(claims).split(".")
+    return ".".join([header, _segment({**claims, "sub": "otro@example.com"}), signature])
+
+
+def _unsigned(claims: dict) -> str:
+    return ".".join([_segment({"alg": "none", "typ": "JWT"}), _segment(claims), ""])
+
+
+NOW = int(time.time())
+VALID = {"sub": "user@example.com", "exp": NOW + 600}
+
+TOKENS = {
+    "valid": _sign(VALID),
+    "valid_with_iat_and_nbf": _sign({**VALID, "iat": NOW, "nbf": NOW - 5}),
+    "float_exp": _sign({**VALID, "exp": NOW + 600.5}),
+    "no_exp": _sign({"sub": "user@example.com"}),
+    "tampered": _tampered(VALID),
+    "other_key": jwt.encode(VALID, "otra-clave", algorithm="HS256"),
+    "alg_none": _unsigned(VALID),
+    "hs512": jwt.encode(VALID, settings.SECRET_KEY, algorithm="HS512"),
+    "expired": _sign({**VALID, "exp": NOW - 60}),
+    "not_yet_valid": _sign({**VALID, "nbf": NOW + 600}),
+    "audience": _sign({**VALID, "aud": "otra-api"}),
+    "numeric_sub": _sign({**VALID, "sub": 42}),
+    "numeric_jti": _sign({**VALID, "jti": 7}),
+    "text_iat": _sign({**VALID, "iat": "ayer"}),
+    "numeric_string_exp": _sign({**VALID, "exp": str(NOW + 600)}),
+    "numeric_string_expired": _sign({**VALID, "exp": str(NOW - 60)}),
+    "text_nbf": _sign({**VALID, "nbf": "pronto"}),
+    "not_a_jwt": "no.es.un-token",
+    "two_segments": "abc.def",
+}
+
+
+@pytest.mark.parametrize("name", TOKENS)
+def test_fast_path_matches_jose(name):
+    token = TOKENS[name]
+    assert _decode_hs256(token) == _decode_jose(token)
+
+
+def test_fast_path_accepts_our_tokens_and_rejects_the_rest():
+    accepted = {name for name, token in TOKENS.items() if _decode_hs256(token) is not None}
+    assert accepted == {
+        "valid", "valid_with_iat_and_nbf", "float_exp", "no_exp", "numeric_string_exp",
+    }
+
+
+def test_password_jobs_beyond_the_queue_limit_are_shed(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_LIMIT", 1)
+    limit = settings.PASSWORD_HASH_WORKERS + 1
+    release = threading.Event()
+
+    async def run():
+        jobs = [asyncio.ensure_future(security._run_password_job(release.wait)) for _ in range(limit)]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(security.PasswordHasherBusy):
+                await security._run_password_job(release.wait)
+        finally:
+            # Libera los hilos del pool de bcrypt aunque la comprobación falle
+            release.set()
+        await asyncio.gather(*jobs)
+        # Los huecos se liberan al terminar: el siguiente trabajo vuelve a entrar
+        return await security._run_password_job(lambda: "ok")
+
+    assert asyncio.run(run()) == "ok"
+    assert security._password_jobs == 0
+
+
+def test_login_returns_503_with_retry_after_when_hasher_is_full(client, db, monkeypatch):
+    db.add(User(email="busy@example.com", hashed_password=security.get_password_hash("secreto", rounds=4)))
+    db.commit()
+    try:
+        full = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+        monkeypatch.setattr(security, "_password_jobs", full)
+        response = client.post("/auth/login", json={"email": "busy@example.com", "password": "secreto"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(settings.PASSWORD_HASH_RETRY_AFTER)
+
+        monkeypatch.setattr(security, "_password_jobs", 0)
+        response = client.post("/auth/login", json={"email": "busy@example.com", "password": "secreto"})
+        assert response.status_code == 200, response.text
+    finally:
+        db.query(User).filter(User.email == "busy@example.com").delete()
+        db.commit()
@@ -0,0 +1,97 @@
+"""
+Pruebas de la rutina de arranque de la base de datos (app.db.startup).
+
+Las del advisory lock y los índices inválidos necesitan PostgreSQL (TEST_POSTGRES_URL).
+"""
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db import startup
+
+@pytest.fixture
+def sqlite_file(tmp_path, monkeypatch):
+    """run_startup contra un fichero SQLite vacío (Alembic también lee settings.DATABASE_URL)"""
+    url = f"sqlite:///{tmp_path / 'startup.db'}"
+    file_engine = create_engine(url)
+    monkeypatch.setattr(settings, "DB_URL", url)
+    monkeypatch.setattr(startup, "DATABASE_URL", url)
+    monkeypatch.setattr(startup, "engine", file_engine)
+    yield file_engine
+    file_engine.dispose()
+
+
+@pytest.fixture
+def pg_engine(postgres_engine, monkeypatch):
+    monkeypatch.setattr(startup, "engine", postgres_engine)
+    return postgres_engine
+
+
+def test_startup_refuses_pending_migrations_without_migrate(sqlite_file):
+    with pytest.raises(RuntimeError, match="setup_database.py"):
+        startup.run_startup(migrate=False)
+
+
+def test_startup_migrates_once_then_only_checks(sqlite_file):
+    report = startup.run_startup()
+    assert report["status"] == "updated"
+    assert report["actions"] == ["create_all", "initial_user"]
+    assert report["revision"] == startup.head_revision()
+
+    report = startup.run_startup(migrate=False)
+    assert report["status"] == "current"
+    assert report["actions"] == []
+    assert list(report["phases_ms"]) == ["check"]
+
+
+def test_migration_lock_waits_without_a_transaction_and_times_out(pg_engine, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STARTUP_LOCK_TIMEOUT_SECONDS", 1.0)
+    holder = pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    holder.execute(text("SELECT pg_advisory_lock(:key)"), {"key": startup.MIGRATION_LOCK_KEY})
+    try:
+        states = []
+
+        def watch():
+            # Mientras el otro sondea, ninguna sesión debe quedar con una transacción abierta
+            with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                states.extend(conn.execute(text(
+                    "SELECT state FROM pg_stat_activity "
+                    "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                )).scalars())
+
+        timer = threading.Timer(0.6, watch)
+        timer.start()
+        with pytest.raises(RuntimeError, match="lock de migraciones"):
+            with startup._migration_lock({"phases_ms": {}}):
+                pass
+        timer.join()
+        assert states and "idle in transaction" not in states
+    finally:
+        holder.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": startup.MIGRATION_LOCK_KEY})
+        holder.close()
+
+    report = {"phases_ms": {}}
+    with startup._migration_lock(report) as lock_conn:
+        assert lock_conn is not None
+    assert "lock" in report["phases_ms"]
+
+
+def test_drop_invalid_indexes_removes_interrupted_concurrent_builds(pg_engine):
+    with pg_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("DROP TABLE IF EXISTS startup_invalid_index"))
+        conn.execute(text("CREATE TABLE startup_invalid_index (value integer)"))
+        conn.execute(text("INSERT INTO startup_invalid_index VALUES (1), (1)"))
+        try:
+            # Un UNIQUE CONCURRENTLY que falla deja el índice creado pero INVALID
+            with pytest.raises(Exception):
+                conn.execute(text(
+                    "CREATE UNIQUE INDEX CONCURRENTLY ix_startup_invalid "
+                    "ON startup_invalid_index (value)"
+                ))
+            assert startup.drop_invalid_indexes(conn) == ["ix_startup_invalid"]
+            assert conn.execute(text("SELECT to_regclass('ix_startup_invalid')")).scalar() is None
+        finally:
+            conn.execute(text("DROP TABLE startup_invalid_index"))
@@ -0,0 +1,81 @@
+"""
+Prueba de número de sentencias SQL por endpoint de tareas (SQLite en memoria, ver conftest.py)
+Ejecutar con: python -m pytest test_statement_counts.py
+"""
+
+import pytest
+
+from app.db.instrumentation import StatementTracker
+
+
+@pytest.fixture
+def request_counted(client, engine):
+    def request(method: str, url: str, **kwargs):
+        """Respuesta y número de sentencias ejecutadas durante la petición"""
+        with StatementTracker(engine) as tracker:
+            response = client.request(method, url, **kwargs)
+        tracker.assert_no_repeats()
+        return response, tracker.count
+    return request
+
+
+@pytest.fixture
+def create(client):
+    def create(title: str = "Tarea de prueba") -> int:
+        return client.post("/tasks/", json={"title": title}).json()["id"]
+    return create
+
+
+def test_create_task_is_one_statement(request_counted):
+    response, count = request_counted("POST", "/tasks/", json={"title": "Nueva", "status": "pending"})
+    assert response.status_code == 201, response.text
+    assert response.json()["id"] > 0
+    assert count == 1
+
+
+def test_read_task_is_one_statement(request_counted, create):
+    task_id = create()
+    response, count = request_counted("GET", f"/tasks/{task_id}")
+    assert response.status_code == 200
+    assert count == 1
+
+
+def test_update_task_is_one_statement(request_counted, create):
+    task_id = create()
+    response, count = request_counted("PUT", f"/tasks/{task_id}", json={"status": "done"})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "done"
+    assert count == 1
+
+
+def test_update_missing_task_is_one_statement(request_counted):
+    response, count = request_counted("PUT", "/tasks/999999", json={"status": "done"})
+    assert response.status_code == 404
+    assert count == 1
+
+
+def test_delete_task_is_one_statement(request_counted, create):
+    task_id = create()
+    response, count = request_counted("DELETE", f"/tasks/{task_id}")
+    assert response.status_code == 204
+    assert count == 1
+
+    response, count = request_counted("DELETE", f"/tasks/{task_id}")
+    assert response.status_code == 404
+    assert count == 1
+
+
+def test_list_tasks_statement_count_by_count_mode(request_counted, create):
+    create()
+    for mode, expected in (("exact", 2), ("window", 1), ("none", 1)):
+        response, count = request_counted("GET", "/tasks/", params={"count": mode})
+        assert response.status_code == 200
+        assert count == expected, f"count={mode}: {count} sentencias"
+
+
+def test_repeated_statements_are_detected(client, engine, create):
+    ids = [create(f"Tarea {i}") for i in range(3)]
+    with StatementTracker(engine) as tracker:
+        for task_id in ids:
+            client.get(f"/tasks/{task_id}")
+    assert tracker.repeated(3), "tres lecturas sueltas deberían verse como N+1"
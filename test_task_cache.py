@@ -0,0 +1,152 @@
+"""
+Prueba de la caché de tareas con los backends memory y redis (fakeredis)
+Ejecutar con: python -m pytest test_task_cache.py
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+
+import fakeredis
+from sqlalchemy.util import greenlet_spawn
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend
+from app.services.task_cache import TaskCache
+
+CREATED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def backends():
+    return [MemoryCacheBackend(100, 60), RedisCacheBackend(fakeredis.FakeRedis())]
+
+
+def row(task_id: int, title: str) -> dict:
+    return {"id": task_id, "title": title, "status": "pending", "created_at": CREATED_AT}
+
+
+def page(*items) -> dict:
+    return {"items": list(items), "total": len(items), "page": 1, "page_size": 10}
+
+
+def test_item_is_served_from_cache_until_invalidated():
+    for backend in backends():
+        cache = TaskCache(backend, 60)
+        db = {1: row(1, "v1")}
+        assert cache.get_task(1, lambda: db.get(1)).title == "v1"
+        db[1] = row(1, "v2")
+        assert cache.get_task(1, lambda: db.get(1)).title == "v1", backend.name
+        cache.invalidate([1])
+        assert cache.get_task(1, lambda: db.get(1)).title == "v2", backend.name
+        assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_invalidation_only_affects_given_ids():
+    for backend in backends():
+        cache = TaskCache(backend, 60)
+        loads = []
+
+        def load(task_id):
+            loads.append(task_id)
+            return row(task_id, "t")
+
+        for task_id in (1, 2):
+            cache.get_task(task_id, lambda: load(task_id))
+        cache.invalidate([1])
+        for task_id in (1, 2):
+            cache.get_task(task_id, lambda: load(task_id))
+        assert loads == [1, 2, 1], backend.name
+
+
+def test_write_during_load_does_not_leave_stale_item():
+    for backend in backends():
+        cache = TaskCache(backend, 60)
+        db = {1: row(1, "viejo")}
+
+        def load_then_concurrent_write():
+            # La lectura ya cargó la fila; otro proceso confirma e invalida antes del set
+            loaded = db[1]
+            db[1] = row(1, "nuevo")
+            cache.invalidate([1])
+            return loaded
+
+        assert cache.get_task(1, load_then_concurrent_write).title == "viejo"
+        assert cache.get_task(1, lambda: db[1]).title == "nuevo", backend.name
+
+
+def test_missing_task_is_not_cached():
+    for backend in backends():
+        cache = TaskCache(backend, 60)
+        assert cache.get_task(7, lambda: None) is None
+        assert cache.get_task(7, lambda: row(7, "t")).title == "t", backend.name
+
+
+def test_any_write_invalidates_list_pages():
+    for backend in backends():
+        cache = TaskCache(backend, 60)
+        params = {"page": 1, "page_size": 10}
+        db = [row(1, "a")]
+        assert len(cache.get_tasks(params, lambda: page(*db))["items"]) == 1
+        db.append(row(2, "b"))
+        assert len(cache.get_tasks(params, lambda: page(*db))["items"]) == 1
+        cache.invalidate()
+        assert len(cache.get_tasks(params, lambda: page(*db))["items"]) == 2, backend.name
+
+
+def test_failing_backend_falls_back_to_loader():
+    class BrokenBackend(MemoryCacheBackend):
+        def get(self, key):
+            raise ConnectionError("caído")
+
+    cache = TaskCache(BrokenBackend(10, 60), 60)
+    assert cache.get_task(1, lambda: row(1, "t"))["title"] == "t"
+    assert cache.errors == 1
+
+
+
+def test_generation_counters_expire_after_their_ttl():
+    backend = MemoryCacheBackend(100, 60, counter_ttl=0.05)
+    cache = TaskCache(backend, 60)
+    cache.invalidate([1])
+    assert backend.get_counter("tasks:gen:item:1") == 1
+    time.sleep(0.1)
+    assert backend.get_counter("tasks:gen:item:1") == 0
+    cache.invalidate([1])
+    assert backend.get_counter("tasks:gen:item:1") == 1
+
+    client = fakeredis.FakeRedis()
+    cache = TaskCache(RedisCacheBackend(client, counter_ttl=600), 60)
+    cache.invalidate([1, 2])
+    assert 60 < client.ttl("tasks:gen:item:1") <= 600
+    assert 60 < client.ttl("tasks:gen:list") <= 600
+
+
+def test_memory_backend_purges_expired_counters():
+    backend = MemoryCacheBackend(100, 60, counter_ttl=0.05)
+    backend.incr_many([f"c:{n}" for n in range(1000)])
+    time.sleep(0.1)
+    backend.incr_many([f"d:{n}" for n in range(100)])
+    assert backend.stats()["counters"] == 100
+
+
+def test_redis_calls_leave_the_event_loop_thread():
+    # Con DB_ASYNC los servicios corren en el hilo del loop dentro de run_sync (greenlet)
+    threads = []
+
+    class RecordingRedis(fakeredis.FakeRedis):
+        def get(self, key):
+            threads.append(threading.get_ident())
+            return super().get(key)
+
+    cache = TaskCache(RedisCacheBackend(RecordingRedis()), 60)
+
+    async def read_on_loop():
+        return await greenlet_spawn(cache.get_task, 1, lambda: row(1, "t"))
+
+    assert asyncio.run(read_on_loop()).title == "t"
+    assert cache.errors == 0
+    assert threads and threading.get_ident() not in threads
+
+    threads.clear()
+    assert cache.get_task(1, lambda: row(1, "t")).title == "t"
+    assert threads == [threading.get_ident(), threading.get_ident()]
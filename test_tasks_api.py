@@ -0,0 +1,207 @@
+"""
+Pruebas de los endpoints de tareas (SQLite en memoria, ver conftest.py)
+Ejecutar con: python -m pytest test_tasks_api.py
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.models.task import Task, TaskStatus
+
+
+def create(client, title: str = "Tarea de prueba", **fields) -> dict:
+    response = client.post("/tasks/", json={"title": title, **fields})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def walk(client, **params) -> list:
+    """Ids de todas las páginas siguiendo next_cursor"""
+    seen = []
+    params = {"page_size": 3, **params}
+    # Más páginas de las posibles significa que el cursor no avanza
+    for _ in range(100):
+        body = client.get("/tasks/", params=params).json()
+        seen.extend(item["id"] for item in body["items"])
+        if not body["has_next"]:
+            return seen
+        params["cursor"] = body["next_cursor"]
+    raise AssertionError(f"el cursor no avanza: {seen[:30]}")
+
+
+def test_cursor_pagination_visits_every_task_once(client):
+    ids = [create(client, f"Página {i}")["id"] for i in range(7)]
+    for sort in ("-created_at", "created_at", "title", "-title", "id", "-id"):
+        seen = walk(client, sort=sort)
+        assert len(seen) == len(set(seen)), f"sort={sort}: ids repetidos {seen}"
+        assert sorted(seen) == sorted(ids), f"sort={sort}: {seen}"
+
+
+def seed(db) -> dict:
+    """Tareas con fechas fijas; devuelve {título: id}"""
+    rows = [
+        ("Alpha", TaskStatus.PENDING, 1), ("Beta", TaskStatus.DONE, 2),
+        ("Alpine", TaskStatus.IN_PROGRESS, 3), ("Gamma", TaskStatus.DONE, 4), ("Delta", TaskStatus.PENDING, 5),
+    ]
+    tasks = [
+        Task(title=title, status=status, created_at=datetime(2024, 1, day, tzinfo=timezone.utc))
+        for title, status, day in rows
+    ]
+    db.add_all(tasks)
+    db.commit()
+    return {task.title: task.id for task in tasks}
+
+
+def titles(client, **params) -> list:
+    response = client.get("/tasks/", params={"page_size": 100, **params})
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()["items"]]
+
+
+def test_filters_combine_and_restrict_the_list(client, db):
+    seed(db)
+    assert sorted(titles(client, status=["pending", "done"])) == ["Alpha", "Beta", "Delta", "Gamma"]
+    assert sorted(titles(client, created_from="2024-01-02T00:00:00Z", created_to="2024-01-04T00:00:00Z")) == [
+        "Alpine", "Beta",
+    ]
+    assert sorted(titles(client, title_prefix="Alp")) == ["Alpha", "Alpine"]
+    assert titles(client, title_prefix="Alp", status="pending") == ["Alpha"]
+    assert client.get("/tasks/", params={"status": "archived"}).status_code == 422
+
+
+def test_sort_orders_and_unknown_sort(client, db):
+    seed(db)
+    assert titles(client) == ["Delta", "Gamma", "Alpine", "Beta", "Alpha"]
+    assert titles(client, sort="created_at") == ["Alpha", "Beta", "Alpine", "Gamma", "Delta"]
+    assert titles(client, sort="title") == ["Alpha", "Alpine", "Beta", "Delta", "Gamma"]
+    assert titles(client, sort="-title") == ["Gamma", "Delta", "Beta", "Alpine", "Alpha"]
+    assert titles(client, sort="-id") == ["Delta", "Gamma", "Alpine", "Beta", "Alpha"]
+    assert client.get("/tasks/", params={"sort": "description"}).status_code == 422
+
+
+def test_count_with_cursor_reports_the_whole_total(client):
+    for i in range(5):
+        create(client, f"Total {i}")
+    cursor = client.get("/tasks/", params={"page_size": 2}).json()["next_cursor"]
+    for mode, total in (("window", 5), ("exact", 5), ("none", None)):
+        body = client.get("/tasks/", params={"page_size": 2, "cursor": cursor, "count": mode}).json()
+        assert body["total"] == total, f"count={mode}: {body['total']}"
+        assert len(body["items"]) == 2
+
+
+def test_if_none_match_returns_304(client):
+    task = create(client)
+    response = client.get(f"/tasks/{task['id']}")
+    etag = response.headers["etag"]
+    assert client.get(f"/tasks/{task['id']}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/tasks/{task['id']}", headers={"If-None-Match": '"otra"'}).status_code == 200
+
+    list_etag = client.get("/tasks/").headers["etag"]
+    assert client.get("/tasks/", headers={"If-None-Match": list_etag}).status_code == 304
+
+
+def test_if_match_with_current_etag_applies_the_change(client):
+    task = create(client)
+    etag = client.get(f"/tasks/{task['id']}").headers["etag"]
+    response = client.put(f"/tasks/{task['id']}", json={"status": "done"}, headers={"If-Match": etag})
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "done"
+
+    # Sin cambios que aplicar también se valida la versión
+    etag = response.headers["etag"]
+    assert client.put(f"/tasks/{task['id']}", json={}, headers={"If-Match": etag}).status_code == 200
+
+    etag = client.get(f"/tasks/{task['id']}").headers["etag"]
+    assert client.delete(f"/tasks/{task['id']}", headers={"If-Match": etag}).status_code == 204
+
+
+def test_stale_if_match_returns_412(client):
+    task = create(client)
+    stale = f'"{task["id"]}-1"'
+    assert client.put(f"/tasks/{task['id']}", json={"status": "done"}, headers={"If-Match": stale}).status_code == 412
+    assert client.put(f"/tasks/{task['id']}", json={}, headers={"If-Match": stale}).status_code == 412
+    assert client.delete(f"/tasks/{task['id']}", headers={"If-Match": stale}).status_code == 412
+    # ETag de otra tarea
+    assert client.delete(f"/tasks/{task['id']}", headers={"If-Match": '"999999-1"'}).status_code == 412
+    assert client.get(f"/tasks/{task['id']}").json()["status"] == "pending"
+
+
+def test_unknown_task_returns_404(client):
+    assert client.get("/tasks/999999").status_code == 404
+    assert client.put("/tasks/999999", json={"status": "done"}, headers={"If-Match": '"999999-1"'}).status_code == 404
+    assert client.delete("/tasks/999999", headers={"If-Match": '"999999-1"'}).status_code == 404
+
+
+def test_bulk_create_all_or_nothing_and_per_item(client):
+    items = [{"title": "Bulk 1"}, {"title": ""}, {"title": "Bulk 3", "status": "done"}]
+    response = client.post("/tasks/bulk", json={"items": items})
+    assert response.status_code == 422
+    assert [error["index"] for error in response.json()["detail"]] == [1]
+    assert client.get("/tasks/").json()["total"] == 0
+
+    response = client.post("/tasks/bulk", json={"items": items, "mode": "per_item"})
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert [task["title"] for task in body["created"]] == ["Bulk 1", "Bulk 3"]
+    assert [error["index"] for error in body["errors"]] == [1]
+
+
+def test_bulk_update_and_delete_by_ids_and_filter(client):
+    ids = [create(client, f"Bulk {i}", status="pending")["id"] for i in range(4)]
+    response = client.post("/tasks/bulk/update", json={
+        "ids": ids[:2], "changes": {"status": "done", "description": None}, "return_ids": True,
+    })
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 2, "ids": ids[:2]}
+    assert [client.get(f"/tasks/{task_id}").json()["status"] for task_id in ids] == [
+        "done", "done", "pending", "pending",
+    ]
+
+    response = client.post("/tasks/bulk/delete", json={"filter": {"status": ["done"]}})
+    assert response.status_code == 200, response.text
+    assert response.json()["affected"] == 2
+    assert sorted(walk(client)) == ids[2:]
+
+
+def test_bulk_update_rejects_null_and_empty_changes(client):
+    task_id = create(client)["id"]
+    for changes in ({"title": None}, {"status": None}, {}):
+        response = client.post("/tasks/bulk/update", json={"ids": [task_id], "changes": changes})
+        assert response.status_code == 422, f"{changes}: {response.status_code}"
+    response = client.post("/tasks/bulk/update", json={"ids": [task_id], "filter": {"status": ["done"]},
+                                                        "changes": {"status": "done"}})
+    assert response.status_code == 422
+    assert client.get(f"/tasks/{task_id}").json()["status"] == "pending"
+
+
+def test_export_ndjson_streams_every_filtered_task_in_order(client, db, monkeypatch):
+    ids = seed(db)
+    # Lotes de 2: la exportación cruza varios lotes del cursor de servidor
+    monkeypatch.setattr(settings, "TASK_EXPORT_BATCH_SIZE", 2)
+    response = client.get("/tasks/export", params={"sort": "title", "status": ["pending", "done"]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert 'filename="tasks.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Alpha", "Beta", "Delta", "Gamma"]
+    assert rows[0] == {
+        "id": ids["Alpha"], "title": "Alpha", "description": None, "status": "pending",
+        "created_at": rows[0]["created_at"], "updated_at": None,
+    }
+    assert rows[0]["created_at"].startswith("2024-01-01T00:00:00")
+
+
+def test_export_csv_has_header_and_one_row_per_task(client, db):
+    seed(db)
+    response = client.get("/tasks/export", params={"format": "csv", "sort": "created_at"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "title", "description", "status", "created_at", "updated_at"]
+    assert [row[1] for row in rows[1:]] == ["Alpha", "Beta", "Alpine", "Gamma", "Delta"]
+
+    response = client.get("/tasks/export", params={"format": "csv", "title_prefix": "Nada"})
+    assert list(csv.reader(io.StringIO(response.text))) == [rows[0]]